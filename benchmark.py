@@ -0,0 +1,540 @@
+# Performance measurements of ChartBuilder module:
+# python benchmark.py            ## run all benchmarks
+# python benchmark.py csv        ## run selected benchmarks
+
+import sys
+import os
+import csv
+import shutil
+import time
+import random
+import tempfile
+import tracemalloc
+import subprocess
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+from chartbuilder.chartbuilder import Scatter, LineGraph, Bar, Pie, Dashboard, QuantileSketch, SpatialIndex, ChartDataHelper as CDH
+
+def timeit(func, repeat: int = 3):
+    """ Return the best time (in seconds) of several runs of func """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def report(name: str, seconds: float, items: int = None, unit: str = 'rows'):
+    if items:
+        print(f"  {name:<40} {seconds * 1000:10.2f} ms  {items / seconds:14,.0f} {unit}/s")
+    else:
+        print(f"  {name:<40} {seconds * 1000:10.2f} ms")
+
+def bench_csv():
+    """ Streaming CSV loader vs naive csv.reader + list building """
+    rows = 1000000
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, 'data.csv')
+        with open(filename, 'w', newline = '') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'x', 'y', 'value', 'name'])
+            for i in range(rows):
+                writer.writerow([i, random.random() * 1000, random.random() * 1000, random.randint(1, 99), 'item'])
+
+        def naive():
+            x_y = []
+            with open(filename, newline = '') as f:
+                reader = csv.reader(f)
+                next(reader)
+                for row in reader:
+                    x_y.append((float(row[1]), float(row[2])))
+            return x_y
+
+        def streaming():
+            return [chunk for chunk in CDH.csv_read_chunks(filename, columns = ['x', 'y'])]
+
+        def histogram():
+            return CDH.data_count_chunks(CDH.csv_read_chunks(filename, columns = ['value'], dtype = int), step = 10)
+
+        print(f"CSV loader, {rows:,} rows, 2 of 5 columns:")
+        report('csv.reader + list', timeit(naive), rows)
+        report('csv_read_chunks', timeit(streaming), rows)
+        report('csv_read_chunks + data_count_chunks', timeit(histogram), rows)
+
+def bench_series():
+    """ Coordinates extracted once at construction vs per-point scan in each Plot() """
+    points = 200000
+    ordered = [(i, random.random()) for i in range(points)]
+    shuffled = random.sample(ordered, len(ordered))
+
+    def per_point_scan():
+        for dataset in (ordered, shuffled):
+            dataset = CDH.data_sort_by_x(dataset)
+            [value[0] for value in dataset if hasattr(value, '__len__') and len(value) == 2]
+            [value[1] for value in dataset if hasattr(value, '__len__') and len(value) == 2]
+
+    print(f"LineData with {points:,} points (ordered + shuffled):")
+    report('sort + per-point scan (one render)', timeit(per_point_scan), 2 * points, 'points')
+    report('LineData construction (ordered)', timeit(lambda: LineGraph.LineData(ordered)), points, 'points')
+    report('LineData construction (shuffled)', timeit(lambda: LineGraph.LineData(shuffled)), points, 'points')
+    line = LineGraph.LineData(ordered)
+    report('cached x, y access', timeit(lambda: (line.x, line.y)))
+
+class LegacyScatterData():
+    """ ScatterData as it was before __slots__: own palette lists & linear color lookup """
+    __colors = [*matplotlib.colors.BASE_COLORS.keys(), *matplotlib.colors.CSS4_COLORS.keys()]
+    __markers = [*matplotlib.lines.Line2D.markers.keys()]
+
+    def __init__(self, dataset, label = None, color = None, marker = None):
+        self.dataset = list(dataset)
+        self.label = label
+        if color is None or color not in (self.__colors):
+            color = self.__colors[random.randint(0,len(self.__colors)-1)]
+        self.color = color
+        if marker is None or marker not in (self.__markers):
+            marker = self.__markers[0]
+        self.marker = marker
+
+class CachedScatterData(LegacyScatterData):
+    """ ScatterData after coordinates cache: __dict__, separate x & y arrays, list lookup """
+    def __init__(self, dataset, label = None, color = None, marker = None):
+        super().__init__(dataset, label, color, marker)
+        points = np.asarray(self.dataset, dtype = float)
+        self.x, self.y, self.dropped = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1]), 0
+        del self.dataset
+
+def bench_containers():
+    """ Memory & construction time per small series """
+    series = 20000
+    dataset = [(i, i * 2) for i in range(10)]
+    colors = ['yellowgreen', 'b', 'whitesmoke', 'teal']
+
+    def build(cls):
+        return [cls(dataset, 'Series', colors[i % len(colors)], 'o') for i in range(series)]
+
+    def memory(cls, own: bool = False):
+        ## own: each series is built from its own points (kept alive only by the series), as data read from files
+        tracemalloc.start()
+        datasets = [[(i * 0.5, i * 2.5) for i in range(len(dataset))] for j in range(series)] if own else None
+        items = [cls(datasets.pop() if own else dataset, 'Series', colors[i % len(colors)], 'o') for i in range(series)]
+        del datasets
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size / len(items)
+
+    print(f"{series:,} series of {len(dataset)} points (memory: shared points / own points of each series):")
+    for name, cls in (('legacy (__dict__, list lookup)', LegacyScatterData), ('cached x, y arrays (__dict__)', CachedScatterData),
+                      ('ScatterData (__slots__)', Scatter.ScatterData)):
+        seconds = timeit(lambda: build(cls))
+        print(f"  {name:<40} {seconds / series * 1e6:10.2f} us/series {memory(cls):6.0f} / {memory(cls, True):4.0f} bytes/series")
+
+def bench_background():
+    """ Scatter over large map: full-resolution background vs background scaled to axes size """
+    from PIL import Image
+    side = 6000
+    with tempfile.TemporaryDirectory() as folder:
+        mapfile = os.path.join(folder, 'map.jpg')
+        gradient = np.linspace(0, 255, side, dtype = np.uint8)
+        Image.fromarray(np.dstack([*np.meshgrid(gradient, gradient), np.full((side, side), 128, np.uint8)])).save(mapfile, quality = 80)
+        points = [(random.random() * side, random.random() * side) for i in range(1000)]
+
+        def render(prescale):
+            p = Scatter('Map')
+            p.setSize(800, 600)
+            p.setBgImage(mapfile, prescale)
+            p.HideTicks()
+            p.fileToSave(os.path.join(folder, 'map.png'))
+            p.Plot(p.ScatterData(points, 'Track', 'r'))
+            matplotlib.pyplot.close('all')
+
+        print(f"Scatter 800x600 over {side}x{side} JPEG map:")
+        report('full resolution (plt.imread)', timeit(lambda: render(False), 2))
+        Scatter.bgimage_cache.clear()
+        report('prescaled, first render', timeit(lambda: render(True), 1))
+        report('prescaled, cached', timeit(lambda: render(True), 3))
+        Scatter.bgimage_cache.clear()
+        Scatter.bgimage_cache.pyramid = True
+        report('pyramid, first render', timeit(lambda: render(True), 1))
+        Scatter.bgimage_cache.clear()
+        Scatter.bgimage_cache.pyramid = False
+
+def bench_animation():
+    """ Movement track: Scatter.Plot per frame vs blitted animation """
+    frames = 100
+    track = np.cumsum(np.random.normal(0, 5, (frames, 2)), axis = 0) + 300
+    with tempfile.TemporaryDirectory() as folder:
+        mapfile = os.path.join(folder, 'square_map.jpg')
+        shutil.copyfile(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img', 'square_map.jpg'), mapfile)
+        prepared_map, width, height, corner_points = CDH.map_prepare(mapfile)
+
+        def chart():
+            p = Scatter('Track')
+            p.setSize(width, height)
+            p.setBgImage(prepared_map)
+            p.HideTicks()
+            return p
+
+        def per_frame():
+            p = chart()
+            for i in range(frames):
+                p.fileToSave(os.path.join(folder, f'plot_{i:05d}.png'))
+                p.Plot(p.ScatterData(corner_points, None, 'k', '+'), p.ScatterData(track[:i + 1], 'Track', 'r'), p.ScatterData(track[i:i + 1], None, 'b', 'o'))
+                matplotlib.pyplot.close('all')
+
+        def animation(filename):
+            p = chart()
+            trail = (p.ScatterData(track[:i + 1], 'Track', 'r') for i in range(frames))
+            return p.Animate(((item, p.ScatterData(track[i:i + 1], None, 'b', 'o')) for i, item in enumerate(trail)), p.ScatterData(corner_points, None, 'k', '+'), filename = os.path.join(folder, filename))
+
+        print(f"Animation, {frames} frames {width}x{height} over map:")
+        seconds = timeit(per_frame, 1)
+        print(f"  {'Plot() per frame (PNG files)':<40} {seconds * 1000:10.2f} ms {frames / seconds:10.1f} frames/s")
+        for name, filename in (('Animate (PNG sequence)', 'frame_{:05d}.png'), ('Animate (GIF)', 'track.gif')):
+            stats = animation(filename)
+            print(f"  {name:<40} {stats['seconds'] * 1000:10.2f} ms {stats['fps']:10.1f} frames/s (render only {stats['render_fps']:.1f} frames/s)")
+
+def bench_dashboard():
+    """ Report page: four Plot() calls stitched with PIL vs one Dashboard """
+    from PIL import Image
+    bgimage = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img', 'bgimage.jpg')
+    points = [(random.gauss(5, 1), random.gauss(5, 1)) for i in range(2000)]
+    counted = CDH.data_count([random.randint(1, 30) for i in range(2000)])
+
+    def charts():
+        s, l, b, p = Scatter('Scatter', 'x', 'y'), LineGraph('Line', 'x', 'y'), Bar('Bar', 'x', 'y'), Pie('Pie')
+        return [(s, [s.ScatterData(points, 'A', 'r')]), (l, [l.LineData(counted, 'B', 'b')]),
+                (b, [b.BarData(counted, 'C', 'g')]), (p, [p.PieData(list(counted)[:6], 'D')])]
+
+    with tempfile.TemporaryDirectory() as folder:
+        def separate():
+            images = []
+            for i, (chart, data) in enumerate(charts()):
+                chart.setBgImage(bgimage)
+                chart.fileToSave(os.path.join(folder, f'{i}.png'))
+                chart.Plot(*data)
+                images.append(Image.open(chart.filename))
+            page = Image.new('RGB', (1600, 1200))
+            for i, img in enumerate(images):
+                page.paste(img, ((i % 2) * 800, (i // 2) * 600))
+            page.save(os.path.join(folder, 'page.png'))
+            matplotlib.pyplot.close('all')
+
+        def dashboard():
+            d = Dashboard('Report')
+            d.setBgImage(bgimage)
+            for chart, data in charts():
+                d.addChart(chart, *data)
+            d.fileToSave(os.path.join(folder, 'dashboard.png'))
+            d.Plot()
+            matplotlib.pyplot.close('all')
+
+        print("Report page of 4 charts (1600x1200):")
+        report('4 x Plot() + PIL stitching', timeit(separate))
+        report('Dashboard', timeit(dashboard))
+
+def bench_live():
+    """ Live metrics: re-created LineData vs ring buffer LiveData """
+    ticks, per_tick, capacity = 100, 5000, 200000
+    values = np.random.normal(0, 1, ticks * per_tick).cumsum()
+
+    def recreate():
+        history = []
+        for tick in range(ticks):
+            history.extend((i, values[i]) for i in range(tick * per_tick, (tick + 1) * per_tick))
+            history = history[-capacity:]
+            line = LineGraph.LineData(history)
+            line.x, line.y
+
+    def live():
+        line = LineGraph.LiveData(capacity)
+        for tick in range(ticks):
+            for i in range(tick * per_tick, (tick + 1) * per_tick):
+                line.append(i, values[i])
+            line.x, line.y
+
+    print(f"Live metrics: {ticks} renders, {per_tick:,} new points per render, last {capacity:,} points:")
+    report('re-created LineData', timeit(recreate, 1), ticks * per_tick, 'points')
+    report('LiveData.append + view', timeit(live, 1), ticks * per_tick, 'points')
+    line = LineGraph.LiveData(capacity)
+    line.extend(np.arange(len(values)), values)
+    line.view()
+    start = [len(values)]
+
+    def update():
+        line.extend(np.arange(start[0], start[0] + per_tick), values[:per_tick])
+        start[0] += per_tick
+        line.view()
+
+    report(f'LiveData.extend + view ({len(line.x):,} of {len(line):,})', timeit(update, 10), per_tick, 'points')
+
+def bench_encoding():
+    """ Encoding time & size of image by encoding profile """
+    import io
+    counted = CDH.data_count([random.randint(1, 60) for i in range(5000)])
+    points = [(random.gauss(5, 1), random.gauss(5, 1)) for i in range(5000)]
+    bgimage = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img', 'bgimage.jpg')
+    for name, chart, data in (('Bar (flat colors)', Bar('Bar', 'x', 'y'), lambda p: [p.BarData(counted, 'A', 'b')]),
+                              ('Scatter over image', Scatter('Scatter', 'x', 'y'), lambda p: [p.ScatterData(points, 'A', 'r')])):
+        if isinstance(chart, Scatter):
+            chart.setBgImage(bgimage)
+        print(f"{name}, 800x600:")
+        for profile in (None, 'fast', 'small', 'webp', 'jpeg'):
+            chart.setEncoding(profile)
+            encode, total, size = [], [], 0
+            for i in range(3):
+                chart.fileToSave(io.BytesIO())
+                chart.Plot(*data(chart))
+                info = chart.encode_info
+                encode.append(info['seconds'] if profile else float('nan'))
+                total.append(info['seconds'] + info.get('render_seconds', 0.0))
+                size = info['bytes']
+            label = f"{profile or 'default (savefig)'} [{info['format']}]"
+            print(f"  {label:<30} encode {min(encode) * 1000:8.2f} ms  render+encode {min(total) * 1000:8.2f} ms {size / 1024:8.1f} KiB")
+
+FIRST_RENDER = """
+import io, sys, time, random
+import matplotlib
+matplotlib.use('Agg')
+from chartbuilder.chartbuilder import Scatter, warmup
+warm = warmup([sys.argv[2]])['seconds'] if sys.argv[1] == 'warm' else 0.0
+def render():
+    p = Scatter('Scatter', 'x', 'y')
+    p.setBgImage(sys.argv[2])
+    p.setEncoding('fast')
+    p.fileToSave(io.BytesIO())
+    start = time.perf_counter()
+    p.Plot(p.ScatterData([(random.random(), random.random()) for i in range(1000)], 'A', 'r'))
+    return time.perf_counter() - start
+first = render()
+steady = min(render() for i in range(5))
+print(warm, first, steady)
+"""
+
+def bench_warmup():
+    """ First render in fresh process (cold & after warmup) vs steady state """
+    bgimage = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img', 'bgimage.jpg')
+    env = dict(os.environ, PYTHONPATH = os.path.dirname(os.path.abspath(__file__)))
+    print("Fresh process, Scatter 800x600 over image:")
+    for mode in ('cold', 'warm'):
+        out = subprocess.run([sys.executable, '-c', FIRST_RENDER, mode, bgimage], env = env, capture_output = True, text = True, check = True).stdout
+        warm, first, steady = [float(value) for value in out.split()]
+        print(f"  {mode:<6} warmup {warm * 1000:8.2f} ms  first render {first * 1000:8.2f} ms  steady state {steady * 1000:8.2f} ms")
+
+COLD_RENDER = """
+import sys, json
+from chartbuilder.spec import render_spec
+render_spec(json.loads(sys.argv[1]))
+"""
+
+def bench_server():
+    """ Chart specs: new process per chart vs in-process rendering vs render server (localhost) """
+    import json
+    import threading
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+    from chartbuilder.spec import render_spec
+    from chartbuilder.server import RenderServer
+    count, clients = 48, 8
+    rng = np.random.default_rng(1)
+    spec = {"chart": "Scatter", "title": "Scatter", "encoding": "fast",
+            "data": [{"dataset": rng.normal(size = (2000, 2)).round(3).tolist(), "label": "A", "color": "r"}]}
+    body = json.dumps(spec)
+    env = dict(os.environ, PYTHONPATH = os.path.dirname(os.path.abspath(__file__)), MPLBACKEND = 'Agg')
+    print(f"{count} charts (Scatter, 2000 points):")
+    report('new process per chart', timeit(lambda: [subprocess.run([sys.executable, '-c', COLD_RENDER, body], env = env, check = True) for i in range(count // 8)], 1) * 8, count, 'charts')
+    report('in-process, sequential', timeit(lambda: [render_spec(spec) for i in range(count)], 1), count, 'charts')
+    server = RenderServer(('127.0.0.1', 0), queue_size = count, quiet = True)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/render"
+    def post(i):
+        with urllib.request.urlopen(urllib.request.Request(url, data = body.encode())) as response:
+            return response.read()
+    try:
+        with ThreadPoolExecutor(clients) as executor:
+            list(executor.map(post, range(server.processes))) ## workers are started
+            report(f'server, {server.processes} workers, {clients} clients', timeit(lambda: list(executor.map(post, range(count))), 3), count, 'charts')
+        latency = server.state()["latency_seconds"]
+        print(f"  {'':<40} render latency p50 {latency['p50'] * 1000:.1f} ms, p99 {latency['p99'] * 1000:.1f} ms")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def bench_batch():
+    """ JSONL file of chart specs: sequential rendering vs batch (worker processes), rerun with manifest """
+    import json
+    from chartbuilder.spec import render_file
+    from chartbuilder.batch import run_batch, read_specs
+    count = 48
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        specs = os.path.join(tmp, 'specs.jsonl')
+        with open(specs, 'w') as f:
+            for i in range(count):
+                spec = {"chart": "LineGraph", "title": f"Line {i}", "encoding": "fast", "output": os.path.join(tmp, 'out', f"line{i}.png"),
+                        "data": [{"x": list(range(500)), "y": rng.normal(size = 500).cumsum().round(3).tolist(), "label": "A"}]}
+                f.write(json.dumps(spec) + '\n')
+        print(f"{count} charts (LineGraph, 500 points):")
+        def sequential():
+            for number, spec, error in read_specs(specs):
+                render_file(spec, os.path.join(tmp, 'seq', f"{number}.png"))
+        report('sequential, in-process', timeit(sequential, 1), count, 'charts')
+        report(f'batch, {os.cpu_count()} workers', timeit(lambda: run_batch(specs), 1), count, 'charts')
+        report('batch rerun, all unchanged', timeit(lambda: run_batch(specs), 3), count, 'charts')
+
+def bench_categories():
+    """ Points colored by category: one ScatterData per category vs one ScatterData with values """
+    rng = np.random.default_rng(1)
+    count = 200000
+    points = rng.normal(size = (count, 2))
+    for categories in (20, 200):
+        names = np.array([f'c{i:03d}' for i in range(categories)])[rng.integers(0, categories, count)]
+        p = Scatter('Scatter', 'x', 'y')
+        p.setRenderBudget(None, None) ## compare drawing of all points
+        with tempfile.TemporaryDirectory() as tmp:
+            p.fileToSave(os.path.join(tmp, 'categories.png'))
+            print(f"Scatter, {count:,} points, {categories} categories:")
+            def series():
+                order = np.argsort(names, kind = 'stable')
+                keys, starts = np.unique(names[order], return_index = True)
+                p.Plot(*[p.ScatterData(points[group], key, 'r') for key, group in zip(keys.tolist(), np.split(order, starts[1:]))])
+            report('ScatterData per category', timeit(series, 1), count, 'points')
+            report('ScatterData with values (palette)', timeit(lambda: p.Plot(p.ScatterData(points, 'A', values = names)), 1), count, 'points')
+
+def bench_spatial():
+    """ Viewport crops of large track set: data_crop (list & array scan) vs SpatialIndex """
+    rng = np.random.default_rng(1)
+    count, queries = 3000000, 50
+    points = np.c_[np.cumsum(rng.normal(size = count)), np.cumsum(rng.normal(size = count))] ## track-like
+    listed = points[:count // 10].tolist()
+    start = time.perf_counter()
+    index = SpatialIndex(points)
+    print(f"Track of {count:,} points, index of {index.cells[0]}x{index.cells[1]} cells built in {(time.perf_counter() - start) * 1000:.2f} ms:")
+    min_x, min_y, max_x, max_y = index.bounds
+    for zoom in (1, 4, 16, 64):
+        width, height = (max_x - min_x) / zoom, (max_y - min_y) / zoom
+        left = min_x + rng.random(queries) * (max_x - min_x - width)
+        bottom = min_y + rng.random(queries) * (max_y - min_y - height)
+        tiles = [(x, y, x + width, y + height) for x, y in zip(left.tolist(), bottom.tolist())]
+        found = sum(len(index.query(*tile)) for tile in tiles) // queries
+        print(f"  viewport 1/{zoom} of map, {found:,} points in average:")
+        report('  data_crop, list (1/10 of points)', timeit(lambda: CDH.data_crop(listed, *tiles[0]), 1), len(listed), 'points')
+        report('  data_crop, array', timeit(lambda: [CDH.data_crop(points, *tile) for tile in tiles], 1) / queries, count, 'points')
+        report('  SpatialIndex.crop', timeit(lambda: [index.crop(*tile) for tile in tiles], 1) / queries, count, 'points')
+
+def bench_quantiles():
+    """ Accuracy, memory & speed of quantile sketch vs exact quantiles """
+    count, chunks, workers = 5000000, 50, 8
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(3, 1, count) ## latency-like distribution
+    exact = np.sort(values)
+    qs = np.linspace(0, 1, 1001)
+
+    def rank_error(sketch):
+        return np.abs(np.searchsorted(exact, sketch.quantiles(qs), side = 'right') / count - qs).max()
+
+    def chunked():
+        sketch = QuantileSketch(seed = 1)
+        for chunk in np.array_split(values, chunks):
+            sketch.update(chunk)
+        return sketch
+
+    def merged():
+        parts = [QuantileSketch(seed = i).update(part) for i, part in enumerate(np.array_split(values, workers))]
+        for part in parts[1:]:
+            parts[0].merge(part)
+        return parts[0]
+
+    print(f"Quantiles of {count:,} values (exact: {values.nbytes / 2 ** 20:.1f} MiB of values):")
+    report('exact (np.quantile)', timeit(lambda: np.quantile(values, qs), 1), count, 'values')
+    for name, build in ((f'sketch, {chunks} chunks', chunked), (f'sketch, {workers} merged parts', merged)):
+        sketch = build()
+        report(name, timeit(build, 1), count, 'values')
+        print(f"  {'':<40} max rank error {rank_error(sketch):.4f}, {sketch.size()} values stored ({sketch.size() * 8 / 1024:.1f} KiB)")
+
+def bench_planner():
+    """ Large series: plain drawing vs strategy chosen by render planner """
+    rng = np.random.default_rng(1)
+    steps = np.arange(1000000, dtype = float)
+    cases = (
+        ('Scatter, 1,000,000 points', Scatter('Scatter', 'x', 'y'), lambda p: [p.ScatterData(rng.normal(size = (1000000, 2)), 'A', 'r')]),
+        ('LineGraph, 1,000,000 points', LineGraph('LineGraph', 'x', 'y'), lambda p: [p.LineData(np.c_[steps, np.cumsum(rng.normal(size = steps.size))], 'A', 'b')]),
+        ('Bar, 10,000 bars', Bar('Bar', 'x', 'y'), lambda p: [p.BarData(np.c_[steps[:10000], rng.normal(size = 10000)], 'A', 'g')]),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, chart, data in cases:
+            data = data(chart)
+            print(f"{name}:")
+            for fmt in ('png', 'svg'):
+                filename = os.path.join(tmp, f'plan.{fmt}')
+                chart.fileToSave(filename)
+                for budget in ((None, None), (1.0, 512)):
+                    chart.setRenderBudget(*budget)
+                    seconds = timeit(lambda: chart.Plot(*data), 1)
+                    plan = chart.render_plan["items"][0]
+                    label = f"{fmt}, {plan['strategy']} ({plan['points_drawn']:,} drawn)"
+                    report(label, seconds)
+                    print(f"  {'':<40} {os.path.getsize(filename) / 1024:10.1f} KiB, estimated {plan['estimated_seconds'] * 1000:.0f} ms")
+
+def bench_timeaxis():
+    """ Timestamps on x-axis: list of (datetime, value) vs arrays of datetime64 & epoch numbers """
+    import datetime
+    count = 300000
+    rng = np.random.default_rng(1)
+    stamps = np.datetime64('2026-01-01T00:00:00') + np.arange(count) * np.timedelta64(10, 's')
+    values = np.cumsum(rng.normal(size = count))
+    points = list(zip(stamps.astype(datetime.datetime).tolist(), values.tolist()))
+    epoch = stamps.astype('datetime64[ms]').astype(np.int64)
+    p = LineGraph('LineGraph', 'time', 'y')
+    p.setRenderBudget(None, None) ## compare conversion, not drawing strategy
+    cases = (
+        ('datetime list, per-element', lambda: p.LineData(points, 'A', 'b', time = False)),
+        ('datetime list, vectorized', lambda: p.LineData(points, 'A', 'b')),
+        ('datetime64 array', lambda: p.LineData.fromArrays(stamps, values, 'A', 'b')),
+        ('epoch array, ms', lambda: p.LineData.fromArrays(epoch, values, 'A', 'b', time = 'ms')),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        p.fileToSave(os.path.join(tmp, 'time.png'))
+        print(f"LineGraph, {count:,} timestamps:")
+        for name, build in cases:
+            report(f"{name}", timeit(build, 3), count, 'points')
+            report(f"{name} + Plot", timeit(lambda: p.Plot(build()), 1), count, 'points')
+        print(f"Bar, {count:,} timestamps:")
+        hours = {}
+        def naive():
+            hours.clear()
+            for stamp, value in points:
+                hour = stamp.replace(minute = 0, second = 0)
+                hours[hour] = hours.get(hour, 0) + value
+            return Bar.BarData(list(hours.items()), 'A', 'g', time = False)
+        report('per hour, dict of datetime', timeit(naive, 3), count, 'points')
+        report('per hour, bucket', timeit(lambda: Bar.BarData.fromArrays(stamps, values, 'A', 'g', bucket = '1h'), 3), count, 'points')
+
+BENCHMARKS = {
+    'csv': bench_csv,
+    'series': bench_series,
+    'containers': bench_containers,
+    'background': bench_background,
+    'animation': bench_animation,
+    'dashboard': bench_dashboard,
+    'live': bench_live,
+    'encoding': bench_encoding,
+    'warmup': bench_warmup,
+    'quantiles': bench_quantiles,
+    'planner': bench_planner,
+    'timeaxis': bench_timeaxis,
+    'server': bench_server,
+    'batch': bench_batch,
+    'categories': bench_categories,
+    'spatial': bench_spatial,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS.keys())
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,45 @@
+# Command line of ChartBuilder:
+# python -m chartbuilder serve [--host 127.0.0.1] [--port 8080] [--processes N] [--queue N] [--timeout S] [--background FILE ...]
+# python -m chartbuilder batch specs.jsonl [--output-dir DIR] [--processes N] [--in-flight N] [--timeout S] [--manifest FILE] [--force]
+
+import sys
+import argparse
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m chartbuilder', description = 'Simple chartbuilder based on matplotlib library')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    serve = commands.add_parser('serve', help = 'run render server (POST /render, GET /metrics, GET /health)')
+    serve.add_argument('--host', default = '127.0.0.1', help = 'address of server, default 127.0.0.1')
+    serve.add_argument('--port', type = int, default = 8080, help = 'port of server, default 8080')
+    serve.add_argument('--processes', type = int, default = None, help = 'count of worker processes, default count of CPU')
+    serve.add_argument('--queue', type = int, default = None, help = 'maximum count of requests in progress, default 2 * processes')
+    serve.add_argument('--timeout', type = float, default = 30.0, help = 'maximum seconds of rendering, default 30')
+    serve.add_argument('--background', action = 'append', default = [], help = 'background image loaded by workers on start (repeatable)')
+    serve.add_argument('--allow-files', action = 'store_true', help = 'allow references to local files in chart specs')
+    serve.add_argument('--quiet', action = 'store_true', help = "don't log requests")
+
+    batch = commands.add_parser('batch', help = 'render chart specs of JSONL file (one spec with "output" per line)')
+    batch.add_argument('specs', help = 'JSONL file of chart specs')
+    batch.add_argument('--output-dir', default = None, help = 'folder of output files, default current folder')
+    batch.add_argument('--processes', type = int, default = None, help = 'count of worker processes, default count of CPU')
+    batch.add_argument('--in-flight', type = int, default = None, help = 'maximum count of specs in progress, default 4 * processes')
+    batch.add_argument('--timeout', type = float, default = 60.0, help = 'maximum seconds without finished spec (hung workers are restarted), default 60')
+    batch.add_argument('--manifest', default = None, help = "manifest of rendered outputs, default SPECS.manifest.json, '' - without manifest")
+    batch.add_argument('--force', action = 'store_true', help = 'render all specs, even unchanged')
+    batch.add_argument('--background', action = 'append', default = [], help = 'background image loaded by workers on start (repeatable)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        from .server import serve as run_server
+        run_server(args.host, args.port, processes = args.processes, queue_size = args.queue, timeout = args.timeout,
+                   backgrounds = args.background, files = args.allow_files, quiet = args.quiet)
+    elif args.command == 'batch':
+        from .batch import run_batch, format_summary
+        summary = run_batch(args.specs, args.output_dir, args.processes, args.in_flight, args.manifest, args.force, args.background,
+                            log = lambda message: print(message, file = sys.stderr), timeout = args.timeout)
+        print(format_summary(summary))
+        return 1 if summary['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# Batch rendering: renders chart specs (see spec.py) from JSONL file (one spec per line) on the pool of worker processes.
+# python -m chartbuilder batch specs.jsonl [--output-dir DIR] [--processes N] [--in-flight N] [--timeout SECONDS] [--manifest FILE] [--force]
+# Each spec has "output": name of image file (format by extension, if spec has no "format").
+# Lines are read one by one, so count of specs in memory is limited by in_flight, not by size of file.
+# Manifest (JSON: output -> hash of spec & referenced files) allows to skip outputs which inputs are unchanged.
+# If no spec is finished in timeout seconds, workers are considered hung: specs in progress fail & workers are restarted.
+
+import os
+import json
+import hashlib
+import queue
+import time
+import functools
+from typing import Union
+
+from . import __version__
+from .chartbuilder import QuantileSketch, worker_pool
+from .spec import render_file, CONTENT_TYPES, SpecError
+
+def read_specs(filename: str):
+    """
+        This function reads JSONL file of chart specs line by line
+
+        :param filename: name of JSONL file
+        :return: Generator of (number of line, spec | None, error message | None), empty lines are skipped
+    """
+    with open(filename, 'r', encoding = 'utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spec = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(spec, dict) or not isinstance(spec.get('output'), str) or not spec['output']:
+                yield number, None, 'Chart spec must be an object with "output" (name of image file)'
+                continue
+            yield number, spec, None
+
+def spec_files(spec: dict) -> list:
+    """
+        This function returns local files referenced by chart spec (background image, CSV files of data)
+
+        :param spec: chart spec
+        :return: list of file names
+    """
+    files = [spec['bgimage']] if isinstance(spec.get('bgimage'), str) else []
+    for item in spec.get('data', []) if isinstance(spec.get('data'), list) else []:
+        if isinstance(item, dict) and isinstance(item.get('file'), str):
+            files.append(item['file'])
+    return files
+
+def spec_hash(spec: dict) -> str:
+    """
+        This function returns hash of inputs of chart: spec, version of chartbuilder & size, time of modification
+        of referenced files (files aren't read, so unchanged output is skipped without reading its data)
+
+        :param spec: chart spec
+        :return: hex digest (sha256)
+    """
+    digest = hashlib.sha256(__version__.encode())
+    digest.update(json.dumps(spec, sort_keys = True, separators = (',', ':')).encode())
+    for filename in spec_files(spec):
+        try:
+            stat = os.stat(filename)
+            digest.update(f"\n{filename}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(f"\n{filename}:missing".encode())
+    return digest.hexdigest()
+
+def load_manifest(filename: str) -> dict:
+    try:
+        with open(filename, 'r', encoding = 'utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def save_manifest(filename: str, manifest: dict):
+    temp = f"{filename}.tmp"
+    with open(temp, 'w', encoding = 'utf-8') as f:
+        json.dump(manifest, f, indent = 1, sort_keys = True)
+    os.replace(temp, filename)
+
+def run_batch(filename: str, output_dir: Union[str, None] = None, processes: Union[int, None] = None, in_flight: Union[int, None] = None,
+              manifest: Union[str, None] = None, force: bool = False, backgrounds: Union[list, None] = None, log = None,
+              timeout: Union[float, None] = 60.0) -> dict:
+    """
+        This function renders all chart specs of JSONL file by worker processes
+
+        :param filename: name of JSONL file of chart specs
+        :param output_dir: folder of output files (for relative names), default current folder
+        :param processes: count of worker processes, default count of CPU
+        :param in_flight: maximum count of specs sent to workers & not finished yet, default 4 * count of worker processes
+        :param manifest: name of manifest file, default filename + '.manifest.json', '' - without manifest
+        :param force: render all specs, even unchanged
+        :param backgrounds: background image files loaded by workers before the first spec
+        :param log: function for messages about failed specs (e.g. print), default without messages
+        :param timeout: maximum seconds without any finished spec, then specs in progress fail (timeouts)
+            & worker processes are restarted, None - wait forever
+        :return: summary: counts of specs (rendered, skipped, failed, timeouts), bytes, seconds, charts per second & latency
+    """
+    start = time.perf_counter()
+    manifest_file = f"{filename}.manifest.json" if manifest is None else manifest
+    hashes = load_manifest(manifest_file) if manifest_file else {}
+    summary = dict.fromkeys(('specs', 'rendered', 'skipped', 'failed', 'timeouts', 'bytes'), 0)
+    latency = QuantileSketch()
+    results = queue.Queue()
+    pool = None
+    pending = {} ## number of line -> job sent to workers & not finished yet
+
+    def failed(number: int, message: str):
+        summary['failed'] += 1
+        if log is not None:
+            log(f"{filename}:{number}: {message}")
+
+    def collect():
+        nonlocal pool, results
+        try:
+            (number, output, digest), info, error = results.get(timeout = timeout)
+        except queue.Empty: ## workers are hung: fail their specs & start new workers
+            summary['timeouts'] += len(pending)
+            for number, output, digest in pending.values():
+                hashes.pop(output, None)
+                failed(number, f"{output}: no result in {timeout} s, workers are restarted")
+            pending.clear()
+            pool.terminate()
+            pool.join()
+            pool = worker_pool(processes, backgrounds)
+            results = queue.Queue() ## late results of terminated workers are ignored
+            return
+        del pending[number]
+        if error is not None:
+            hashes.pop(output, None)
+            failed(number, f"{output}: {error if isinstance(error, SpecError) else f'{type(error).__name__}: {error}'}")
+        else:
+            hashes[output] = digest
+            summary['rendered'] += 1
+            summary['bytes'] += info['bytes']
+            latency.update([info['seconds']])
+
+    try:
+        for number, spec, error in read_specs(filename):
+            summary['specs'] += 1
+            if error is not None:
+                failed(number, error)
+                continue
+            spec = dict(spec)
+            output = spec.pop('output')
+            if output_dir:
+                output = os.path.join(output_dir, output)
+            if 'format' not in spec:
+                fmt = os.path.splitext(output)[1][1:].lower()
+                fmt = 'jpeg' if fmt == 'jpg' else fmt
+                if fmt in CONTENT_TYPES:
+                    spec['format'] = fmt
+            digest = spec_hash(spec)
+            if not force and hashes.get(output) == digest and os.path.exists(output):
+                summary['skipped'] += 1
+                continue
+            if pool is None: ## workers are started only if something has to be rendered
+                processes = processes or os.cpu_count() or 1
+                in_flight = in_flight or 4 * processes
+                os.environ.setdefault('MPLBACKEND', 'Agg')
+                pool = worker_pool(processes, backgrounds)
+            while len(pending) >= in_flight:
+                collect()
+            job = pending[number] = (number, output, digest)
+            pool.apply_async(render_file, (spec, output, True),
+                             callback = functools.partial(lambda results, job, info: results.put((job, info, None)), results, job),
+                             error_callback = functools.partial(lambda results, job, e: results.put((job, None, e)), results, job))
+        while pending:
+            collect()
+    finally:
+        if pool is not None:
+            if pending: ## interrupted
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+        if manifest_file:
+            save_manifest(manifest_file, hashes)
+
+    seconds = time.perf_counter() - start
+    summary.update({
+        "processes"         : processes if pool is not None else 0,
+        "seconds"           : seconds,
+        "charts_per_second" : summary['rendered'] / seconds if seconds else 0.0,
+        "latency_seconds"   : {},
+    })
+    if latency.count:
+        p50, p95 = latency.quantiles([0.5, 0.95]).tolist()
+        summary['latency_seconds'] = {"p50": p50, "p95": p95, "max": latency.max}
+    return summary
+
+def format_summary(summary: dict) -> str:
+    """
+        This function formats summary of batch rendering (see run_batch) for output to console
+
+        :param summary: summary of batch rendering
+        :return: text
+    """
+    lines = [
+        f"{summary['specs']} specs: {summary['rendered']} rendered, {summary['skipped']} skipped (unchanged), {summary['failed']} failed"
+        + (f" ({summary['timeouts']} timed out)" if summary.get('timeouts') else ''),
+        f"{summary['seconds']:.2f} s, {summary['charts_per_second']:.1f} charts/s on {summary['processes']} workers, "
+        f"{summary['bytes'] / 2 ** 20:.1f} MB written",
+    ]
+    if summary['latency_seconds']:
+        latency = summary['latency_seconds']
+        lines.append(f"rendering per chart: p50 {latency['p50'] * 1000:.0f} ms, p95 {latency['p95'] * 1000:.0f} ms, max {latency['max'] * 1000:.0f} ms")
+    return '\n'.join(lines)
@@ -2,6 +2,7 @@
 # Homepage: https://github.com/greentracery/ChartBuilder
 # Requirements:
 # - matplotlib
+# - numpy
 # - Pillow (PIL)
 # Usage:
 # p = Scatter('Main Title', 'X Axis Label', 'Y Axis Label')
@@ -25,13 +26,249 @@
 
 from typing import List, Union
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+import itertools
+import functools
 import random
+import warnings
+import multiprocessing
+import csv
 import os
+import io
+import re
+import struct
+import time
+import datetime
+import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib import colors as mcolors
+from matplotlib import font_manager
+from matplotlib import dates as mdates
 from matplotlib.lines import Line2D
+from matplotlib.collections import PolyCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from PIL import Image, ImageOps
 
+## Avalaible colors & markers, shared by all charts & datasets:
+_COLORS = (*mcolors.BASE_COLORS.keys(), *mcolors.CSS4_COLORS.keys())
+_MARKERS = (*Line2D.markers.keys(),)
+_COLORS_LOOKUP = frozenset(_COLORS)
+_MARKERS_LOOKUP = frozenset(_MARKERS)
+
+def _is_color(color) -> bool:
+    """ Return is the color avalaible (base or CSS4) """
+    try:
+        return color in _COLORS_LOOKUP
+    except TypeError: ## unhashable value
+        return False
+
+def _is_marker(marker) -> bool:
+    """ Return is the marker avalaible """
+    try:
+        return marker in _MARKERS_LOOKUP
+    except TypeError: ## unhashable value
+        return False
+
+def _is_point(value) -> bool:
+    """ Return is the value a pair of values (x, y) """
+    return hasattr(type(value), '__len__') and hasattr(type(value), '__getitem__') and len(value) == 2
+
+def _is_time(values) -> bool:
+    """ Return are the values timestamps (datetime64, datetime or date objects), missing values (None) are skipped """
+    if np.issubdtype(values.dtype, np.datetime64):
+        return True
+    if values.dtype != object:
+        return False
+    first = next((value for value in values if value is not None), None)
+    return isinstance(first, (datetime.date, np.datetime64))
+
+def _csv_parse(lines: list, delimiter: str, usecols, dtype, ndmin: int, filename: str, first_line: int) -> np.ndarray:
+    """ Parse chunk of CSV lines which np.loadtxt rejects: empty fields are NaN, errors report number of line in file """
+    convert = np.dtype(dtype).type
+    missing = np.nan if np.issubdtype(np.dtype(dtype), np.floating) else None
+    rows = []
+    for number, row in enumerate(csv.reader(lines, delimiter = delimiter), first_line):
+        if not row or (len(row) == 1 and not row[0].strip()) or row[0].lstrip().startswith('#'):
+            continue
+        try:
+            fields = row if usecols is None else [row[i] for i in usecols]
+            if rows and len(fields) != len(rows[0]):
+                raise ValueError(f"expected {len(rows[0])} fields, found {len(fields)}")
+            values = []
+            for field in fields:
+                if field.strip():
+                    values.append(convert(field.strip()))
+                elif missing is not None:
+                    values.append(missing)
+                else:
+                    raise ValueError('empty field')
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"{filename}, line {number}: {e}") from None
+        rows.append(values)
+    result = np.array(rows, dtype = dtype).reshape(len(rows), -1 if rows else (len(usecols) if usecols else 0))
+    return result.ravel() if ndmin == 1 else result
+
+def _random_color() -> str:
+    return random.choice(_COLORS)
+
+def _gif_write(fp, images, duration: int) -> int:
+    """
+        Write animated GIF frame by frame, only current & previous frames are kept in memory:
+        Image.save(save_all = True) collects all frames before writing them.
+        Each frame is quantized with own color table of used colors, only the changed area of frame is written
+        (unchanged pixels inside of it are transparent)
+        
+        :param fp: binary file-like object
+        :param images: iterable of RGB images of the same size
+        :param duration: display time of each frame in milliseconds
+        :return: count of written frames
+    """
+    count = 0
+    previous = None
+    for img in images:
+        current = np.asarray(img)
+        if previous is None:
+            fp.write(b'GIF89a' + struct.pack('<HHBBB', img.size[0], img.size[1], 0, 0, 0))
+            fp.write(b'!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00') ## loop forever
+            changed = np.ones(current.shape[:2], dtype = bool)
+        else:
+            changed = np.any(current != previous, axis = 2)
+            if not changed.any():
+                changed[0, 0] = True
+        previous = current
+        rows, cols = np.nonzero(changed)
+        (left, top, right, bottom) = (cols.min(), rows.min(), cols.max() + 1, rows.max() + 1)
+        changed = changed[top:bottom, left:right]
+        img = img.quantize(256, method = Image.Quantize.FASTOCTREE)
+        area = np.asarray(img)[top:bottom, left:right]
+        used, indexes = np.unique(area[changed], return_inverse = True)
+        if len(used) < 256 and not changed.all():
+            transparent = len(used)
+            pixels = np.full(area.shape, transparent, dtype = np.uint8)
+            pixels[changed] = indexes
+        else: ## whole area is written
+            transparent = None
+            used, indexes = np.unique(area.ravel(), return_inverse = True)
+            pixels = indexes.astype(np.uint8).reshape(area.shape)
+        palette = np.asarray(img.getpalette(), dtype = np.uint8).reshape(-1, 3)[used]
+        colors = len(used) + (transparent is not None)
+        bits = max(1, (colors - 1).bit_length())
+        fp.write(b'!\xf9\x04' + bytes([transparent is not None]) + struct.pack('<HB', round(duration / 10), transparent or 0) + b'\x00')
+        fp.write(b',' + struct.pack('<HHHHB', left, top, right - left, bottom - top, 0x80 | (bits - 1)))
+        fp.write(palette.tobytes() + bytes(3 * ((1 << bits) - len(used))))
+        fp.write(b'\x08' + Image.frombytes('P', (right - left, bottom - top), pixels.tobytes()).tobytes('gif', 'P') + b'\x00')
+        count += 1
+    if count:
+        fp.write(b';')
+    return count
+
+class BgImageCache():
+    """ 
+        This class prepares background images for diagramms: image file is decoded once 
+        & scaled down to the pixel size of axes before it reaches matplotlib.
+        Scaled variants are cached per output size (LRU)
+        
+        property: max_items: maximum count of cached scaled variants
+        property: pyramid: keep decoded image & its reduced copies (1/2, 1/4, ...) in memory,
+            so other output sizes & regions are scaled from the nearest level without decoding file again
+        property: max_pyramids: maximum count of image files kept decoded in pyramid mode (LRU)
+        
+        method: get(filename, size, keep_ratio, region): return scaled image as numpy array
+        method: clear(): drop all cached images
+    """
+    max_items: int = 32
+    pyramid: bool = False
+    max_pyramids: int = 4
+    
+    def __init__(self, max_items: int = 32, pyramid: bool = False, max_pyramids: int = 4):
+        self.max_items = max_items
+        self.pyramid = pyramid
+        self.max_pyramids = max_pyramids
+        self.__scaled = OrderedDict()
+        self.__levels = OrderedDict()
+    
+    def clear(self):
+        self.__scaled.clear()
+        self.__levels.clear()
+    
+    def get(self, filename: str, size: tuple, keep_ratio: bool = False, region: Union[tuple, None] = None):
+        """
+            This method return image scaled down to size (images smaller than size are not enlarged)
+            
+            :param filename: name of image file
+            :param size: output size in pixels (width, height)
+            :param keep_ratio: keep aspect ratio of image (fit image into size)
+            :param region: part of image (left, top, right, bottom) in pixels of source image, default whole image
+            :return: numpy array of image (height x width x RGB|RGBA)
+        """
+        path = os.path.abspath(filename)
+        key = (path, os.path.getmtime(path), tuple(size), keep_ratio, None if region is None else tuple(region))
+        if key in self.__scaled:
+            self.__scaled.move_to_end(key)
+            return self.__scaled[key]
+        if self.pyramid:
+            img = self.__from_pyramid(key[:2], size, region)
+        else:
+            img = self.__from_file(path, size, region)
+        img = self.__resize(img, size, keep_ratio)
+        array = np.asarray(img)
+        self.__scaled[key] = array
+        while len(self.__scaled) > self.max_items:
+            self.__scaled.popitem(last = False)
+        return array
+    
+    def __from_file(self, path: str, size: tuple, region: Union[tuple, None]):
+        img = Image.open(path)
+        if region is None:
+            img.draft(img.mode, tuple(size)) ## JPEG: decode with DCT scaling 1/2, 1/4 or 1/8
+            img = self.__rgb(img)
+            factor = min(img.size[0] // size[0], img.size[1] // size[1])
+            if factor > 1:
+                img = img.reduce(factor)
+            return img
+        return self.__rgb(img).crop(region)
+    
+    def __from_pyramid(self, file_key: tuple, size: tuple, region: Union[tuple, None]):
+        levels = self.__levels.get(file_key)
+        if levels is None:
+            for key in [key for key in self.__levels if key[0] == file_key[0]]: ## file has been changed
+                del self.__levels[key]
+            levels = self.__levels[file_key] = [self.__rgb(Image.open(file_key[0]))]
+            while len(self.__levels) > max(1, self.max_pyramids):
+                self.__levels.popitem(last = False)
+        else:
+            self.__levels.move_to_end(file_key)
+        (width, height) = levels[0].size
+        if region is not None:
+            (width, height) = (region[2] - region[0], region[3] - region[1])
+        scale = 1
+        while width // (scale * 2) >= size[0] and height // (scale * 2) >= size[1]:
+            scale *= 2
+        level = scale.bit_length() - 1
+        while len(levels) <= level:
+            levels.append(levels[-1].reduce(2))
+        img = levels[level]
+        if region is not None:
+            img = img.crop(tuple(int(value / scale) for value in region))
+        return img
+    
+    @staticmethod
+    def __rgb(img):
+        ## reduce() & LANCZOS resize don't work with palette & bilevel images: convert them before scaling
+        img.load()
+        if img.mode in ('RGB', 'RGBA'):
+            return img
+        return img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+    
+    def __resize(self, img, size: tuple, keep_ratio: bool):
+        (width, height) = img.size
+        if keep_ratio:
+            ratio = min(size[0] / width, size[1] / height)
+            size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+        if size[0] >= width and size[1] >= height:
+            return img
+        return img.resize((min(size[0], width), min(size[1], height)), Image.LANCZOS)
+
 class ChartBuilder(ABC): #Prohibits the creation of the class object directly
     """ 
         Abstract class for ChartBuilder, prototype of all avalaible chart types
@@ -39,8 +276,10 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
         property: title: title (or supertitle) for diagramm (all diagramms in one image)
         property: xlabel: name of x-axis
         property: ylabel: name of y-axis
-        property: filename: name of image file to save diagramm
+        property: filename: name of image file (or file-like object) to save diagramm
         property: imgbackground: name of image file used as background image
+        property: bgimage_prescale: scale background image down to the pixel size of axes before drawing, default True
+        property: bgimage_cache: cache of scaled background images (shared by all charts)
         property: facecolor: font color (base or CSS4) for all image
         property: facecolor_alpha: opacity for all image, default 1.0
         property: bgcolor: background color (base or CSS4) for diagramm figure 
@@ -48,22 +287,34 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
         property: fontcolor: font color (base or CSS4) for title (supertitle), x-axis, y-axis, default 'black'
         property: grid: enable or disable grid lines, default True
         property: ticks: enable or disable ticks on x-axis & y-axis, default True
+        property: legend_best_points: maximum count of points for automatic ('best') location of legend, 
+            legend of larger diagramm is placed in upper right corner, default 10000
         property: custom_x_ticks: custom sign for ticks on x-axis, default None
         property: dpi: resolution, default 90
         property: width: image width, defalt 800
         property: height: image height, default 600
+        property: encoding: name of encoding profile for raster image (see encoding_profiles), 
+            default None (format by file extension, default settings of matplotlib)
+        property: encoding_quality: quality of lossy encoding (webp, jpeg), default quality of profile
+        property: encode_info: profile, format, encoding time (seconds) & size (bytes) of the last saved image
+        property: render_budget: time (seconds) & memory (MB) budget for drawing of diagramm (see setRenderBudget), 
+            default None - always plain drawing (cheaper strategies may drop points, so they are enabled explicitly)
+        property: render_plan: drawing strategy chosen for each set of data of the last diagramm (see planRender)
         
         method: setTitle(title): set title property
         method: setXLabel(xlabel): set xlabel property
         method: setYLabel(ylabel): set ylabel property
         method: setSize(width, height): set width & height properties
         method: fileToSave(filename): set filename property
+        method: setEncoding(profile, quality): set encoding & encoding_quality properties
+        method: setRenderBudget(seconds, memory_mb): set render_budget property
+        method: planRender(*data): estimate cost of drawing & choose drawing strategy for each set of data
         method: EnableGrid(): set grid property to True
         method: DisableGrid(): set grid property to False
         method: HideTicks(): set ticks property to False
         method: setFaceColor(facecolor, alpha): set facecolor & facecolor_alpha properties
         method: setBgColor(bgcolor, alpha): set bgcolor & bgcolor_alpha properties
-        method: setBgImage(filename): set imgbackground property
+        method: setBgImage(filename, prescale): set imgbackground & bgimage_prescale properties
         method: showbgimage(minmax, aspect): read background image file & apply it as background of diagramm
         method: setFontColor(color): set fontcolor property
         method: getMarkersList(): return avalaible markers
@@ -76,6 +327,8 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
     ylabel: Union[str, None]
     filename: Union[str, None]
     imgbackground: Union[str, None]
+    bgimage_prescale: bool = True
+    bgimage_cache: BgImageCache = BgImageCache()
     facecolor: Union[str, None]
     facecolor_alpha: float = 1.0
     bgcolor: Union[str, None]
@@ -84,6 +337,7 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
     
     grid: bool = True
     ticks: bool = True
+    legend_best_points: int = 10000
     
     custom_x_ticks: Union[list, None] = None
     
@@ -91,6 +345,43 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
     width: int = 800
     height: int = 600
     
+    encoding: Union[str, None] = None
+    encoding_quality: Union[int, None] = None
+    encode_info: Union[dict, None] = None
+    
+    encoding_profiles = {
+        "fast"  : {"format": "png",  "compress_level": 1},                       ## low compression, fastest encoding
+        "small" : {"format": "png",  "compress_level": 9, "palette": 256},       ## palette quantization + max compression
+        "webp"  : {"format": "webp", "quality": 80},
+        "jpeg"  : {"format": "jpeg", "quality": 85},
+    }
+    vector_formats = ('svg', 'svgz', 'pdf', 'eps', 'ps')
+    
+    render_budget: Union[dict, None] = None
+    render_plan: Union[dict, None] = None
+    
+    ## Estimated cost (seconds, bytes) of one drawn element, measured with Agg (raster) & SVG (vector) backends:
+    render_costs = {
+        "raster": {
+            "base"    : (0.1, 0),
+            "marker"  : (2.0e-6, 100),  ## marker of scatter
+            "vertex"  : (1.0e-6, 50),   ## vertex of line
+            "bar"     : (8.0e-4, 5000), ## bar drawn as separate Rectangle
+            "polygon" : (1.5e-5, 200),  ## bar drawn as polygon of collection
+            "point"   : (1.5e-7, 16),   ## point counted into density grid
+            "pixel"   : (2.0e-8, 32),   ## pixel of density image
+        },
+        "vector": {
+            "base"    : (0.07, 0),
+            "marker"  : (2.3e-5, 110),
+            "vertex"  : (2.0e-7, 40),
+            "bar"     : (9.0e-4, 5200),
+            "polygon" : (7.0e-5, 250),
+            "point"   : (1.5e-7, 16),
+            "pixel"   : (5.0e-8, 40),
+        },
+    }
+    
     margins = {
         "left"   : 0.084,
         "right"  : 0.920,
@@ -98,9 +389,6 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
         "bottom" : 0.092
     }
     
-    __colors = [*mcolors.BASE_COLORS.keys(), *mcolors.CSS4_COLORS.keys()]
-    __markers = [*Line2D.markers.keys()]
-    
     def __init__(self, title = None, xlabel = None, ylabel = None):
         """
             Creates an instance of an object 
@@ -129,6 +417,142 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
     def fileToSave(self, filename: str):
         self.filename = filename
     
+    def setRenderBudget(self, seconds: Union[float, None] = 1.0, memory_mb: Union[float, None] = 512):
+        """
+            This method set time & memory budget for drawing of diagramm: if plain drawing of all sets of data exceeds the budget,
+            the most expensive sets of data are drawn with cheaper strategy (collection, downsampling, density image).
+            Budget is disabled by default; chosen strategy is reported in render_plan & by warning if it drops points
+            
+            :param seconds: time budget, None - unlimited
+            :param memory_mb: memory budget, None - unlimited
+        """
+        if seconds is None and memory_mb is None:
+            self.render_budget = None
+        else:
+            self.render_budget = {"seconds": seconds, "memory_mb": memory_mb}
+    
+    def planRender(self, *data) -> dict:
+        """
+            This method estimates cost of drawing from count of points, pixel size & format of image
+            & choose drawing strategy for each set of data within render_budget:
+            'plain' - each point (bar) is drawn as is, 'collection' - bars are drawn as one collection,
+            'downsample' - only a part of points is drawn (min/max of each pixel column for lines),
+            'density' - points are counted into pixel grid & drawn as image
+            
+            :param *data: sets of source data of diagramm
+            :return: plan: format, pixel size, budget, estimated seconds & MB, strategy for each set of data
+        """
+        fmt = self._outputFormat()
+        costs = self.render_costs["vector" if fmt in self.vector_formats else "raster"]
+        size = (
+            max(1, int(self.width * (self.margins["right"] - self.margins["left"]))),
+            max(1, int(self.height * (self.margins["top"] - self.margins["bottom"]))),
+        )
+        budget = self.render_budget or {}
+        share = (budget.get("seconds") or float('inf')) / max(1, len(data))
+        
+        def cost(elements: dict):
+            return (sum(costs[key][0] * count for key, count in elements.items()),
+                    sum(costs[key][1] * count for key, count in elements.items()) / 2 ** 20)
+        
+        items = []
+        for item in data:
+            candidates = self._renderCandidates(item, size, share, costs)
+            if not candidates:
+                continue
+            if self.render_budget is None:
+                candidates = candidates[:1]
+            items.append({
+                "item"       : item,
+                "candidates" : [(strategy, drawn, *cost(elements)) for strategy, drawn, elements in candidates],
+                "choice"     : 0,
+            })
+        
+        def total(index: int):
+            return costs["base"][index] / (1 if index == 0 else 2 ** 20) + sum(entry["candidates"][entry["choice"]][index + 2] for entry in items)
+        
+        for index, limit in ((0, budget.get("seconds")), (1, budget.get("memory_mb"))):
+            while limit is not None and total(index) > limit:
+                entries = [entry for entry in items if entry["choice"] + 1 < len(entry["candidates"])]
+                if not entries:
+                    break
+                max(entries, key = lambda entry: entry["candidates"][entry["choice"]][index + 2])["choice"] += 1
+        
+        self._strategies = {}
+        plan_items = []
+        for entry in items:
+            strategy, drawn, seconds, mb = entry["candidates"][entry["choice"]]
+            self._strategies[id(entry["item"])] = (strategy, drawn)
+            if drawn < entry["candidates"][0][1]:
+                warnings.warn(f"{type(self).__name__} '{self._itemLabel(entry['item'])}': {strategy} draws {drawn:,} of "
+                              f"{entry['candidates'][0][1]:,} points within render budget")
+            plan_items.append({
+                "label"             : self._itemLabel(entry["item"]),
+                "points"            : entry["candidates"][0][1],
+                "strategy"          : strategy,
+                "points_drawn"      : drawn,
+                "estimated_seconds" : seconds,
+                "estimated_mb"      : mb,
+            })
+        return {
+            "format"            : fmt,
+            "pixels"            : size,
+            "budget"            : self.render_budget,
+            "estimated_seconds" : total(0),
+            "estimated_mb"      : total(1),
+            "items"             : plan_items,
+        }
+    
+    def _renderCandidates(self, item, size: tuple, share: float, costs: dict) -> list:
+        """
+            This method return drawing strategies for set of data, from the most exact to the cheapest
+            
+            :param item: set of source data
+            :param size: pixel size of axes (width, height)
+            :param share: time budget (seconds) for this set of data
+            :param costs: cost of elements (see render_costs)
+            :return: list of (strategy, count of drawn points, {element: count of elements})
+        """
+        return []
+    
+    def _timeAxis(self, ax):
+        """ This method set ticks of x-axis for timestamps (date numbers): ticks are chosen by time range & width of axes """
+        locator = mdates.AutoDateLocator()
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    
+    def _itemLabel(self, item):
+        for name in ('label', 'hist_title', 'bar_title', 'pie_title'):
+            if hasattr(item, name):
+                return getattr(item, name)
+        return None
+    
+    def _itemStrategy(self, item) -> tuple:
+        """ This method return strategy chosen by planRender for set of data: (strategy, count of drawn points) """
+        return getattr(self, '_strategies', {}).get(id(item), ('plain', None))
+    
+    def _outputFormat(self) -> str:
+        """ This method return format of output image """
+        profile = self.encoding_profiles.get(self.encoding)
+        ext = ''
+        if hasattr(self, 'filename') and isinstance(self.filename, str):
+            ext = os.path.splitext(self.filename)[1][1:].lower()
+        if ext in self.vector_formats or profile is None:
+            return ext or plt.rcParams['savefig.format']
+        return profile["format"]
+    
+    def setEncoding(self, profile: Union[str, None] = None, quality: Union[int, None] = None):
+        """
+            This method set encoding profile for raster image (ignored for vector formats: svg, pdf, eps, ps).
+            Profile defines format of image regardless of file extension
+            
+            :param profile: 'fast' | 'small' | 'webp' | 'jpeg' | None (format by file extension)
+            :param quality: quality of lossy encoding (1..100), default quality of profile
+        """
+        if profile is None or profile in self.encoding_profiles:
+            self.encoding = profile
+            self.encoding_quality = quality
+    
     def EnableGrid(self):
         self.grid = True
     
@@ -146,7 +570,7 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
             alpha = 1.0 
         if alpha < 0:
             alpha = 0.0 
-        if facecolor in (self.__colors):
+        if _is_color(facecolor):
             self.facecolor = facecolor
             self.facecolor_alpha = alpha
     
@@ -155,27 +579,36 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
             alpha = 1.0 
         if alpha < 0:
             alpha = 0.0 
-        if bgcolor in (self.__colors):
+        if _is_color(bgcolor):
             self.bgcolor = bgcolor
             self.bgcolor_alpha = alpha
     
-    def setBgImage(self, filename: str):
+    def setBgImage(self, filename: str, prescale: bool = True):
         self.imgbackground = filename
+        self.bgimage_prescale = prescale
         
-    def showbgimage(self, minmax: Union[tuple, None] = None, aspect = 'auto'):
+    def showbgimage(self, minmax: Union[tuple, None] = None, aspect = 'auto', ax = None):
         """
             This method read background image file & apply it as background of diagramm
             
             :param minmax: set of image corners (min_X, max_X, min_Y, max_Y) 
             :param aspect: 'auto' | 'equal'
+            :param ax: axes of diagramm, default current axes
         """
         try:
-            img = plt.imread(self.imgbackground)
+            if ax is None:
+                ax = plt.gca()
+            if self.bgimage_prescale:
+                bbox = ax.get_window_extent()
+                size = (max(1, round(bbox.width)), max(1, round(bbox.height)))
+                img = self.bgimage_cache.get(self.imgbackground, size, keep_ratio = (aspect == 'equal'))
+            else:
+                img = plt.imread(self.imgbackground)
             if minmax is not None:
                 extent = list(minmax)
             else:
                 extent = [0, self.width / self.dpi, 0, self.height / self.dpi]
-            plt.imshow(img, interpolation='antialiased', aspect = aspect, extent=extent)
+            ax.imshow(img, interpolation='antialiased', aspect = aspect, extent=extent)
         except FileNotFoundError:
             pass
         except OSError as e:
@@ -186,20 +619,138 @@ class ChartBuilder(ABC): #Prohibits the creation of the class object directly
             pass
             
     def setFontColor(self, fontcolor:str):
-        if fontcolor in (self.__colors):
+        if _is_color(fontcolor):
             self.fontcolor = fontcolor
             
     def getMarkersList(self):
         """ Return avalaible markers """
-        return self.__markers
+        return list(_MARKERS)
         
     def getColorsList(self):
         """ Return avalaible colors """
-        return self.__colors
+        return list(_COLORS)
     
     def is_sequence(self, obj):
         t = type(obj)
         return hasattr(t, '__len__') and hasattr(t, '__getitem__')
+    
+    def _createFigure(self, rows: int = 1, cols: int = 1):
+        """
+            This method creates figure with size & face color of diagramm
+            
+            :param rows: count of diagramms in one column of image (image height = rows * height)
+            :param cols: count of diagramms in one row of image (image width = cols * width)
+            :return: figure
+        """
+        fig = plt.figure(dpi = self.dpi, figsize = (cols * self.width / self.dpi, rows * self.height / self.dpi) )
+        if hasattr(self, 'facecolor') and self.facecolor is not None:
+            fig.set(facecolor = self.facecolor)
+            fig.set(alpha = self.facecolor_alpha)
+        return fig
+    
+    def _setupAxes(self, ax):
+        """ This method apply background color to the axes """
+        if hasattr(self, 'bgcolor') and self.bgcolor is not None:
+            ax.set(facecolor = self.bgcolor)
+            ax.set(alpha = self.bgcolor_alpha)
+    
+    def _decorateAxes(self, ax, title = None, legend: bool = False):
+        """
+            This method apply background image, title, axis labels, legend, grid & ticks to the axes
+            
+            :param ax: axes of diagramm
+            :param title: title of diagramm
+            :param legend: show legend
+        """
+        min_X, max_X = ax.get_xlim()
+        min_Y, max_Y = ax.get_ylim()
+        
+        if hasattr(self, 'imgbackground') and self.imgbackground is not None:
+            self.showbgimage( (min_X, max_X, min_Y, max_Y), ax = ax )
+        
+        if title is not None:
+            ax.set_title(title, color = self.fontcolor)
+        if self.xlabel is not None:
+            ax.set_xlabel(self.xlabel, color = self.fontcolor)
+        if self.ylabel is not None:
+            ax.set_ylabel(self.ylabel, color = self.fontcolor)
+        if legend:
+            ## 'best' location of legend checks overlapping with each point: slow for large data
+            points = sum(len(artist.get_offsets()) for artist in ax.collections) + sum(len(artist.get_xdata()) for artist in ax.lines)
+            ax.legend(loc = 'best' if points <= self.legend_best_points else 'upper right')
+        
+        ax.grid(self.grid)
+        
+        if not self.ticks:
+            ax.set_xticks([])
+            ax.set_yticks([])
+        else:
+            ax.tick_params(axis = "x", colors = self.fontcolor)
+            ax.tick_params(axis = "y", colors = self.fontcolor)
+    
+    def _save(self, fig):
+        """ This method save figure into the file (or show it) & set encode_info property """
+        if not hasattr(self, 'filename') or self.filename is None:
+            plt.show()
+            return
+        ext = os.path.splitext(self.filename)[1][1:].lower() if isinstance(self.filename, str) else ''
+        profile = self.encoding_profiles.get(self.encoding)
+        if profile is None or ext in self.vector_formats:
+            start = time.perf_counter()
+            fig.savefig(self.filename)
+            seconds = time.perf_counter() - start
+            if isinstance(self.filename, str):
+                size = os.path.getsize(self.filename)
+            else:
+                size = self.filename.tell()
+            self.encode_info = {
+                "profile" : None,
+                "format"  : ext or plt.rcParams['savefig.format'],
+                "seconds" : seconds, ## rendering & encoding
+                "bytes"   : size,
+            }
+        else:
+            start = time.perf_counter()
+            canvas = FigureCanvasAgg(fig)
+            canvas.draw()
+            img = Image.fromarray(np.asarray(canvas.buffer_rgba()))
+            render_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            data = self._encode(img, profile)
+            seconds = time.perf_counter() - start
+            if isinstance(self.filename, str):
+                with open(self.filename, 'wb') as f:
+                    f.write(data)
+            else:
+                self.filename.write(data)
+            self.encode_info = {
+                "profile"        : self.encoding,
+                "format"         : profile["format"],
+                "seconds"        : seconds,
+                "render_seconds" : render_seconds,
+                "bytes"          : len(data),
+            }
+        plt.close(fig)
+    
+    def _encode(self, img, profile: dict):
+        """
+            This method encode RGBA image by encoding profile
+            
+            :param img: RGBA image (PIL)
+            :param profile: encoding profile (see encoding_profiles)
+            :return: bytes of encoded image
+        """
+        buffer = io.BytesIO()
+        quality = self.encoding_quality if self.encoding_quality is not None else profile.get("quality")
+        if profile["format"] == 'png':
+            if "palette" in profile:
+                img = img.quantize(profile["palette"], method = Image.Quantize.FASTOCTREE)
+            img.save(buffer, 'PNG', compress_level = profile.get("compress_level", 6), optimize = "palette" in profile, dpi = (self.dpi, self.dpi))
+        elif profile["format"] == 'webp':
+            img.save(buffer, 'WEBP', quality = quality)
+        elif profile["format"] == 'jpeg':
+            img.convert('RGB').save(buffer, 'JPEG', quality = quality, dpi = (self.dpi, self.dpi))
+        return buffer.getvalue()
         
     @abstractmethod
     def Plot(self):
@@ -209,19 +760,27 @@ class Scatter(ChartBuilder):
     """ 
         ChartBuilder implementation for Scatter diagramm 
         
+        property: legend_max: maximum count of categories in legend (the most frequent ones), default 20
+        
         method: Plot(*data): biuld diagramm and show it (or save into the file)
     """
+    legend_max: int = 20
+    
     class ScatterData():
         """ This class describe data structure for Scatter diagramm """
-        dataset: list ## [(x1,y1),(x2,y2),...]
+        xy: np.ndarray ## [[x1,x2,...],[y1,y2,...]]
+        dropped: int ## count of malformed points excluded from dataset
         label: Union[str, None]
         color: str
         marker: str
+        values: Union[np.ndarray, None] ## value (intensity) or category of each point
+        cmap: Union[str, None]
+        palette: Union[list, dict, None]
         
-        __colors = [*mcolors.BASE_COLORS.keys(), *mcolors.CSS4_COLORS.keys()]
-        __markers = [*Line2D.markers.keys()]
+        __slots__ = ('xy', 'dropped', 'label', 'color', 'marker', 'values', 'cmap', 'palette')
     
-        def __init__(self, dataset: Union[list, tuple] , label = None, color = None, marker = None):
+        def __init__(self, dataset: Union[list, tuple] , label = None, color = None, marker = None, 
+                     values = None, cmap: Union[str, None] = None, palette: Union[list, dict, None] = None):
             """ 
                 Creates an instance of an object ScatterData 
                 
@@ -229,15 +788,57 @@ class Scatter(ChartBuilder):
                 :param label: name of dataset
                 :param color: color for this dataset
                 :param marker: type of marker
+                :param values: value or category of each point: numbers are colored by cmap (with colorbar),
+                    other values (names) or any values with palette are colored by category (with legend)
+                :param cmap: name of matplotlib colormap, default 'viridis' for numbers & 'tab10' | 'tab20' | 'turbo' for categories
+                :param palette: colors of categories: list (in order of sorted categories) or dict {category: color}
             """
-            self.dataset = list(dataset)
             self.label = label
-            if color is None or color not in (self.__colors):
-                color = self.__colors[random.randint(0,len(self.__colors)-1)]
+            if values is not None and not isinstance(dataset, np.ndarray):
+                dataset = list(dataset)
+            self.dataset = dataset
+            if values is not None:
+                values = np.asarray(values)
+                if len(values) != len(dataset):
+                    raise ValueError(f"Count of values ({len(values)}) and count of points ({len(dataset)}) doesn't match")
+                if self.dropped: ## values of malformed points are dropped too
+                    values = values[np.fromiter((_is_point(value) for value in dataset), bool, len(dataset))]
+            self.values = values
+            self.cmap = cmap
+            self.palette = palette
+            if color is None or not _is_color(color):
+                color = _random_color()
             self.color = color
-            if marker is None or marker not in (self.__markers):
-                marker = self.__markers[0]
+            if marker is None or not _is_marker(marker):
+                marker = _MARKERS[0]
             self.marker = marker
+        
+        @property
+        def x(self):
+            """ Contiguous array of x values """
+            return self.xy[0]
+        
+        @property
+        def y(self):
+            """ Contiguous array of y values """
+            return self.xy[1]
+        
+        @property
+        def dataset(self):
+            """ Source data as list of points [(x1,y1),(x2,y2),...] """
+            return list(zip(self.x.tolist(), self.y.tolist()))
+        
+        @dataset.setter
+        def dataset(self, dataset: Union[list, tuple]):
+            self.xy, self.dropped = ChartDataHelper.data_split_xy(dataset)
+            self.values = None ## values belong to previous points
+            if self.dropped:
+                warnings.warn(f"ScatterData '{self.label}': {self.dropped} malformed point(s) dropped")
+        
+        @property
+        def categorical(self) -> bool:
+            """ Values are categories (colored by palette) """
+            return self.values is not None and (self.palette is not None or not np.issubdtype(self.values.dtype, np.number))
     
     def Plot(self, *data: ScatterData):
         """
@@ -245,153 +846,495 @@ class Scatter(ChartBuilder):
             
             :param *data: one or more sets of source data
         """
-        legend = False
-        
-        fig = plt.figure(dpi = self.dpi, figsize = (self.width / self.dpi, self.height / self.dpi) )
-        if hasattr(self, 'facecolor') and self.facecolor is not None:
-            fig.set(facecolor = self.facecolor)
-            fig.set(alpha = self.facecolor_alpha)
-        
+        fig = self._createFigure()
+        self._plotFigure(fig, *data)
+        self._save(fig)
+    
+    def _plotFigure(self, fig, *data: ScatterData):
+        """ This method biuld diagramm in the figure (or in the cell of Dashboard) """
+        self.render_plan = self.planRender(*data)
         fig.subplots_adjust(**self.margins)
-        
         ax = fig.add_subplot(1,1,1)
-        if hasattr(self, 'bgcolor') and self.bgcolor is not None:
-            ax.set(facecolor = self.bgcolor)
-            ax.set(alpha = self.bgcolor_alpha)
-        
+        self._setupAxes(ax)
+        legend = self._drawData(ax, *data)
+        self._decorateAxes(ax, self.title, legend)
+    
+    def _renderCandidates(self, item, size: tuple, share: float, costs: dict) -> list:
+        if not isinstance(item, self.ScatterData):
+            return []
+        count = len(item.x)
+        candidates = [('plain', count, {"marker": count})]
+        pixels = size[0] * size[1]
+        numeric = np.issubdtype(item.xy.dtype, np.number) and item.values is None
+        if numeric and (count > pixels // 4 or self._outputFormat() in self.vector_formats):
+            ## markers overlap each other (or vector image, where random subset would silently lose outliers): 
+            ## density image keeps all points
+            candidates.append(('density', count, {"point": count, "pixel": pixels}))
+        else:
+            drawn = int(min(count, max(1000, share / costs["marker"][0]))) ## share is inf without budget
+            if drawn < count:
+                candidates.append(('downsample', drawn, {"marker": drawn}))
+        return candidates
+    
+    def _drawData(self, ax, *data: ScatterData):
+        """
+            This method draws sets of source data into the axes
+            
+            :return: True if any set of data has a legend label
+        """
+        legend = False
         for item in data:
             if isinstance(item, self.ScatterData):
-                if item.dataset is not None:
-                    x = [value[0] for value in item.dataset if self.is_sequence(value) and len(value) == 2]
-                    y = [value[1] for value in item.dataset if self.is_sequence(value) and len(value) == 2]
-                if item.label is not None:
+                strategy, drawn = self._itemStrategy(item)
+                x, y = item.x, item.y
+                keep = slice(None)
+                if strategy == 'density':
+                    self._drawDensity(ax, item)
+                    x, y = [], [] ## empty scatter keeps legend entry of the set of data
+                elif strategy == 'downsample':
+                    keep = np.sort(np.random.default_rng(0).choice(len(x), drawn, replace = False))
+                    x, y = x[keep], y[keep]
+                if item.values is not None:
+                    legend = self._drawValues(ax, item, keep) or legend
+                elif item.label is not None:
                     ax.scatter(x, y, label=item.label, color=item.color, marker=item.marker)
                     legend = True
                 else:
                     ax.scatter(x, y, color=item.color, marker=item.marker)
+        return legend
+    
+    def _drawValues(self, ax, item: ScatterData, keep = slice(None)):
+        """
+            This method draws set of data colored by values: categories with legend of the most frequent ones (legend_max), 
+            numbers with colorbar. Index of color is computed for all points at once, points of the same color are drawn
+            as one collection (markers of one color are rendered from cached bitmap, several times faster than colored markers)
+            
+            :param keep: indexes of drawn points (see planRender), default all points
+            :return: True if legend is needed
+        """
+        if item.categorical:
+            categories, codes = np.unique(item.values, return_inverse = True)
+            codes = codes.ravel()
+            if isinstance(item.palette, dict):
+                palette = mcolors.to_rgba_array([item.palette.get(category, item.color) for category in categories.tolist()])
+            elif item.palette:
+                palette = mcolors.to_rgba_array(item.palette)[np.arange(len(categories)) % len(item.palette)]
+            else:
+                cmap = plt.get_cmap(item.cmap or ('tab10' if len(categories) <= 10 else 'tab20' if len(categories) <= 20 else 'turbo'))
+                if isinstance(cmap, mcolors.ListedColormap) and item.cmap is None:
+                    palette = cmap(np.arange(len(categories)) % cmap.N)
+                else:
+                    palette = cmap(np.linspace(0, 1, len(categories)))
+        else:
+            values = item.values.astype(float)
+            cmap = plt.get_cmap(item.cmap or 'viridis')
+            norm = mcolors.Normalize(np.nanmin(values), np.nanmax(values)) if len(values) else mcolors.Normalize()
+            ## the same lookup as colormap does: one of cmap.N colors of lookup table, extra color for missing values
+            normed = np.ma.filled(norm(values), np.nan)
+            valid = ~np.isnan(normed)
+            codes = np.full(len(values), cmap.N)
+            codes[valid] = np.clip((normed[valid] * cmap.N).astype(np.intp), 0, cmap.N - 1)
+            palette = np.vstack((cmap(np.arange(cmap.N)), cmap.get_bad()))
+        x, y, codes = item.x[keep], item.y[keep], codes[keep]
+        order = np.argsort(codes, kind = 'stable')
+        starts = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]]) if len(order) else []
+        if len(starts) > 256: ## too many used colors for separate collections
+            ax.scatter(x, y, color = palette[codes], marker = item.marker)
+        else:
+            for group in np.split(order, starts[1:]):
+                ax.scatter(x[group], y[group], color = palette[codes[group[0]]], marker = item.marker)
         
-        min_X, max_X = plt.xlim()
-        min_Y, max_Y = plt.ylim()
-        
-        if hasattr(self, 'imgbackground') and self.imgbackground is not None:
-            self.showbgimage( (min_X, max_X, min_Y, max_Y) )
+        if not item.categorical:
+            colorbar = ax.figure.colorbar(plt.cm.ScalarMappable(norm, cmap), ax = ax)
+            if item.label is not None:
+                colorbar.set_label(item.label, color = self.fontcolor)
+            colorbar.ax.tick_params(colors = self.fontcolor)
+            return False
+        ## legend: empty scatter for each of the most frequent categories
+        counts = np.bincount(codes, minlength = len(categories))
+        shown = np.sort(np.argsort(-counts, kind = 'stable')[:self.legend_max])
+        for index in shown.tolist():
+            ax.scatter([], [], color = palette[index], marker = item.marker, label = str(categories[index]))
+        if len(categories) > len(shown):
+            ax.scatter([], [], color = 'none', label = f"+{len(categories) - len(shown)} more")
+        return True
+    
+    def _drawDensity(self, ax, item: ScatterData):
+        """ This method draws set of data as density image: opacity of pixel depends on count of points in it """
+        bbox = ax.get_window_extent()
+        bins = (max(1, int(bbox.width)), max(1, int(bbox.height)))
+        finite = np.isfinite(item.x) & np.isfinite(item.y) ## NaN & inf aren't drawn, as by plain scatter
+        x, y = item.x[finite], item.y[finite]
+        if not len(x):
+            return
+        extent = []
+        for values in (x, y):
+            low, high = values.min(), values.max()
+            extent += [low, high] if high > low else [low - 0.5, high + 0.5]
+        counts, _, _ = np.histogram2d(x, y, bins = bins, range = (extent[:2], extent[2:]))
+        image = np.zeros((bins[1], bins[0], 4))
+        image[..., :3] = mcolors.to_rgb(item.color)
+        image[..., 3] = np.log1p(counts.T) / np.log1p(counts.max())
+        ax.imshow(image, extent = extent, origin = 'lower', aspect = 'auto', interpolation = 'nearest')
+    
+    def Animate(self, frames, *data: ScatterData, filename: Union[str, None] = None, fps: int = 10, limits: Union[tuple, None] = None):
+        """
+            This method biuld animation: static layer (background image, axes, labels & *data) is rendered once,
+            for each frame only the changing layer (ScatterData | LineGraph.LineData) is blitted over it.
+            Animation is saved as GIF (*.gif) or as image sequence (filename with placeholder for frame number, e.g. 'frame_{:05d}.png')
+            
+            :param frames: iterable of frames, each frame is a sequence of ScatterData | LineGraph.LineData (or one of them)
+            :param *data: static sets of source data (e.g. corner points of map)
+            :param filename: file to save animation, default filename property
+            :param fps: frames per second (for GIF)
+            :param limits: axes limits (min_X, max_X, min_Y, max_Y), default limits of static layer & first frame
+            :return: dict with count of frames, elapsed seconds, frames per second (total & render only)
+        """
+        if filename is None:
+            filename = self.filename if hasattr(self, 'filename') else None
+        if filename is None:
+            raise ValueError('Filename for animation is not set')
+        start = time.perf_counter()
+        frames = iter(frames)
+        first = next(frames, None)
         
-        if self.title is not None:
-            plt.title(self.title, color = self.fontcolor)
-        if self.xlabel is not None:
-            plt.xlabel(self.xlabel, color = self.fontcolor)
-        if self.ylabel is not None:
-            plt.ylabel(self.ylabel, color = self.fontcolor)
-        if legend:
-            plt.legend()
+        fig = self._createFigure()
+        fig.subplots_adjust(**self.margins)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1,1,1)
+        self._setupAxes(ax)
+        self.render_plan = self.planRender(*data)
+        legend = self._drawData(ax, *data)
+        artists = []
+        if first is not None:
+            first = self.__frameItems(first)
+            for item in first:
+                artists.append(self.__frameArtist(ax, item))
+                legend = legend or item.label is not None
+        if limits is not None:
+            ax.set_xlim(limits[0], limits[1])
+            ax.set_ylim(limits[2], limits[3])
+        ax.set_autoscale_on(False)
+        self._decorateAxes(ax, self.title, legend)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
         
-        if self.grid:
-            plt.grid(True)
-        else:
-            plt.grid(False)
+        sequence = isinstance(filename, str) and '{' in filename
+        render_seconds = 0.0
         
-        if not self.ticks:
-            plt.xticks([])
-            plt.yticks([])
-        else:
-            ax.tick_params(axis = "x", colors = self.fontcolor)
-            ax.tick_params(axis = "y", colors = self.fontcolor)
+        def render():
+            nonlocal render_seconds
+            for frame in itertools.chain([first] if first is not None else [], frames):
+                render_start = time.perf_counter()
+                items = self.__frameItems(frame)
+                canvas.restore_region(background)
+                for i, artist in enumerate(artists):
+                    if i < len(items):
+                        self.__frameUpdate(artist, items[i])
+                        ax.draw_artist(artist)
+                for item in items[len(artists):]:
+                    artist = self.__frameArtist(ax, item)
+                    artists.append(artist)
+                    ax.draw_artist(artist)
+                img = Image.fromarray(np.asarray(canvas.buffer_rgba())).convert('RGB')
+                render_seconds += time.perf_counter() - render_start
+                yield img
         
-        if hasattr(self, 'filename') and self.filename is not None:
-            plt.savefig(self.filename)
+        count = 0
+        try:
+            if sequence:
+                for img in render():
+                    img.save(filename.format(count), compress_level = 1)
+                    count += 1
+            elif first is not None:
+                if isinstance(filename, str):
+                    with open(filename, 'wb') as f:
+                        count = _gif_write(f, render(), 1000 / fps)
+                else:
+                    count = _gif_write(filename, render(), 1000 / fps)
+        finally:
+            plt.close(fig)
+        seconds = time.perf_counter() - start
+        return {
+            "frames"     : count,
+            "seconds"    : seconds,
+            "fps"        : count / seconds if seconds > 0 else 0.0,
+            "render_fps" : count / render_seconds if render_seconds > 0 else 0.0,
+        }
+    
+    def __frameItems(self, frame):
+        if isinstance(frame, (self.ScatterData, LineGraph.LineData)):
+            return [frame]
+        return [item for item in frame if isinstance(item, (self.ScatterData, LineGraph.LineData))]
+    
+    def __frameArtist(self, ax, item):
+        """ Creates animated artist for the changing layer """
+        if isinstance(item, self.ScatterData):
+            return ax.scatter(item.x, item.y, label=item.label, color=item.color, marker=item.marker, animated=True)
+        return ax.plot(item.x, item.y, label=item.label, color=item.color, animated=True)[0]
+    
+    def __frameUpdate(self, artist, item):
+        if isinstance(item, self.ScatterData):
+            artist.set_offsets(np.column_stack((item.x, item.y)))
         else:
-            plt.show()
+            artist.set_data(item.x, item.y)
 
 class LineGraph(ChartBuilder):
     """ 
         ChartBuilder implementation for LineGraph diagramm 
+        (sets of source data: LineData or LiveData)
         
         method: Plot(*data): biuld diagramm and show it (or save into the file)
     """
     class LineData():
         """ This class describe data structure for LineGraph diagramm """
-        dataset: list ## [(x1,y1),(x2,y2),...]
+        xy: np.ndarray ## [[x1,x2,...],[y1,y2,...]], sorted by x
+        dropped: int ## count of malformed points excluded from dataset
         label: Union[str, None]
         color: str
+        time: Union[bool, str] ## x values are timestamps (stored as date numbers of matplotlib)
         
-        __colors = [*mcolors.BASE_COLORS.keys(), *mcolors.CSS4_COLORS.keys()]
+        __slots__ = ('xy', 'dropped', 'label', 'color', 'time')
     
-        def __init__(self, dataset: Union[list, tuple] , label = None, color = None):
+        def __init__(self, dataset: Union[list, tuple] , label = None, color = None, time: Union[bool, str, None] = None):
             """ 
                 Creates an instance of an object LineData
                 
                 :param dataset: Source data sequence
                 :param label: name of dataset
                 :param color: color for this dataset
+                :param time: None - detect timestamps (datetime, datetime64) in x values, False - x values are not timestamps,
+                    's', 'ms', 'us', 'ns' - x values are epoch numbers in this unit
+            """
+            self.label = label
+            self.time = time
+            self.dataset = dataset
+            if color is None or not _is_color(color):
+                color = _random_color()
+            self.color = color
+        
+        @classmethod
+        def fromArrays(cls, x, y, label = None, color = None, time: Union[bool, str, None] = None):
+            """ 
+                Creates an instance of an object LineData from arrays of x values & y values (without list of points)
+                
+                :param x: x values (numbers, datetime64 or epoch numbers)
+                :param y: y values
+                :param label: name of dataset
+                :param color: color for this dataset
+                :param time: see __init__
             """
-            self.dataset = ChartDataHelper.data_sort_by_x(list(dataset))
+            item = cls([], label, color, False)
+            item.xy, item.dropped, item.time = ChartDataHelper.data_prepare_xy(np.asarray(x), np.asarray(y), time)
+            if item.dropped:
+                warnings.warn(f"LineData '{label}': {item.dropped} point(s) without timestamp dropped")
+            return item
+        
+        @property
+        def x(self):
+            """ Contiguous array of x values """
+            return self.xy[0]
+        
+        @property
+        def y(self):
+            """ Contiguous array of y values """
+            return self.xy[1]
+        
+        @property
+        def dataset(self):
+            """ Source data as list of points sorted by x [(x1,y1),(x2,y2),...] """
+            if self.time:
+                return list(zip(mdates.num2date(self.x), self.y.tolist()))
+            return list(zip(self.x.tolist(), self.y.tolist()))
+        
+        @dataset.setter
+        def dataset(self, dataset: Union[list, tuple]):
+            xy, self.dropped = ChartDataHelper.data_split_xy(dataset)
+            if self.time is False or (self.time is None and not _is_time(xy[0])):
+                self.xy, self.time = ChartDataHelper.data_sort_xy(xy), False
+            else:
+                self.xy, dropped, self.time = ChartDataHelper.data_prepare_xy(xy[0], xy[1], self.time)
+                self.dropped += dropped
+            if self.dropped:
+                warnings.warn(f"LineData '{self.label}': {self.dropped} malformed point(s) dropped")
+        
+    class LiveData():
+        """ 
+            This class describe data structure for LineGraph diagramm of live metrics.
+            Points are kept in fixed-capacity ring buffer (O(1) append, memory doesn't depend on running time).
+            Long history is decimated by blocks of points (first, min, max & last point of each block); 
+            each block is decimated once, so re-rendering processes only newly appended points
+        """
+        capacity: int ## count of last points kept in buffer
+        max_points: int ## maximum count of points passed to diagramm
+        block: int ## count of points in one decimated block
+        window: Union[float, None] ## x-range of view (last points with x >= last_x - window)
+        label: Union[str, None]
+        color: str
+        
+        __slots__ = ('capacity', 'max_points', 'block', 'window', 'label', 'color', 
+                     '_raw', '_total', '_blocks', '_decimated', '_view')
+        
+        def __init__(self, capacity: int = 100000, label = None, color = None, window: Union[float, None] = None, max_points: int = 4096):
+            """ 
+                Creates an instance of an object LiveData
+                
+                :param capacity: count of last points kept in buffer
+                :param label: name of dataset
+                :param color: color for this dataset
+                :param window: x-range of view, default all points in buffer
+                :param max_points: count of points passed to diagramm, longer history is decimated
+                    (decimated view contains about max_points points + not yet filled block & partial oldest block)
+            """
+            self.capacity = max(1, int(capacity))
+            self.max_points = max(4, int(max_points))
+            self.block = max(1, -(-4 * self.capacity // self.max_points))
+            self.window = window
             self.label = label
-            if color is None or color not in (self.__colors):
-                color = self.__colors[random.randint(0,len(self.__colors)-1)]
+            if color is None or not _is_color(color):
+                color = _random_color()
             self.color = color
+            self._raw = np.zeros((2, self.capacity))
+            self._total = 0 ## count of all appended points
+            self._blocks = np.zeros((2, -(-self.capacity // self.block) + 1, 4)) ## ring of decimated blocks
+            self._decimated = 0 ## count of decimated blocks
+            self._view = None
+        
+        def __len__(self):
+            return min(self._total, self.capacity)
+        
+        def append(self, x, y):
+            """ This method append point (x, y), x must not be less than x of the last point """
+            if self._total and x < self._raw[0, (self._total - 1) % self.capacity]:
+                raise ValueError('x value is less than x value of the last point')
+            i = self._total % self.capacity
+            self._raw[0, i] = x
+            self._raw[1, i] = y
+            self._total += 1
+        
+        def extend(self, x, y):
+            """ This method append points (arrays of x values & y values in ascending order of x) """
+            x = np.asarray(x, dtype = float)
+            y = np.asarray(y, dtype = float)
+            if len(x) != len(y):
+                raise ValueError('count of x values and count of y values doesn\'t match')
+            if len(x) == 0:
+                return
+            if np.any(x[1:] < x[:-1]) or (self._total and x[0] < self._raw[0, (self._total - 1) % self.capacity]):
+                raise ValueError('x values are not in ascending order')
+            count = len(x)
+            x, y = x[-self.capacity:], y[-self.capacity:] ## older points would be overwritten anyway
+            idx = np.arange(self._total + count - len(x), self._total + count) % self.capacity
+            self._raw[0, idx] = x
+            self._raw[1, idx] = y
+            self._total += count
+        
+        @property
+        def x(self):
+            """ Array of x values of view """
+            return self.view()[0]
+        
+        @property
+        def y(self):
+            """ Array of y values of view """
+            return self.view()[1]
         
+        def view(self, window: Union[float, None] = None):
+            """
+                This method return points of view: last points in buffer (decimated if count of them exceeds max_points)
+                
+                :param window: x-range of view, default window property
+                :return: array of x values, array of y values
+            """
+            if window is None:
+                window = self.window
+            if self._view is not None and self._view[0] == (self._total, window):
+                return self._view[1]
+            first = max(0, self._total - self.capacity)
+            if self._total - first <= self.max_points:
+                xy = self._raw[:, np.arange(first, self._total) % self.capacity]
+            else:
+                self.__decimate()
+                complete = self._total // self.block
+                head_end = min(-(-first // self.block) * self.block, self._total)
+                head = self._raw[:, np.arange(first, head_end) % self.capacity]
+                if head.shape[1] > 4: ## partial oldest block (its first points are overwritten) is decimated on the fly
+                    head = head[:, np.unique([0, head[1].argmin(), head[1].argmax(), head.shape[1] - 1])]
+                blocks = np.arange(-(-first // self.block), complete) % self._blocks.shape[1]
+                tail = np.arange(max(complete * self.block, head_end), self._total) % self.capacity
+                xy = np.concatenate((head, self._blocks[:, blocks].reshape(2, -1), self._raw[:, tail]), axis = 1)
+            if window is not None and xy.shape[1]:
+                xy = xy[:, np.searchsorted(xy[0], xy[0, -1] - window):]
+            self._view = ((self._total, window), (xy[0], xy[1]))
+            return self._view[1]
+        
+        def __decimate(self):
+            """ This method decimates blocks of points which were filled since the last call """
+            complete = self._total // self.block
+            start = max(self._decimated, -(-max(0, self._total - self.capacity) // self.block))
+            if start < complete:
+                idx = (np.arange(start * self.block, complete * self.block) % self.capacity).reshape(-1, self.block)
+                x, y = self._raw[0, idx], self._raw[1, idx]
+                rows = np.arange(len(idx))[:, None]
+                pos = np.sort(np.stack((np.zeros(len(idx), dtype = int), y.argmin(axis = 1), y.argmax(axis = 1), 
+                                        np.full(len(idx), self.block - 1)), axis = 1), axis = 1)
+                slots = np.arange(start, complete) % self._blocks.shape[1]
+                self._blocks[0, slots] = x[rows, pos]
+                self._blocks[1, slots] = y[rows, pos]
+            self._decimated = complete
+    
     def Plot(self, *data: LineData):
         """
             This method biuld diagramm and show it (or save into the file)
             
             :param *data: one or more sets of source data
         """
-        legend = False
-        
-        fig = plt.figure(dpi = self.dpi, figsize = (self.width / self.dpi, self.height / self.dpi) )
-        if hasattr(self, 'facecolor') and self.facecolor is not None:
-            fig.set(facecolor = self.facecolor)
-            fig.set(alpha = self.facecolor_alpha)
-        
+        fig = self._createFigure()
+        self._plotFigure(fig, *data)
+        self._save(fig)
+    
+    def _plotFigure(self, fig, *data: LineData):
+        """ This method biuld diagramm in the figure (or in the cell of Dashboard) """
+        self.render_plan = self.planRender(*data)
         fig.subplots_adjust(**self.margins)
-        
         ax = fig.add_subplot(1,1,1)
-        if hasattr(self, 'bgcolor') and self.bgcolor is not None:
-            ax.set(facecolor = self.bgcolor)
-            ax.set(alpha = self.bgcolor_alpha)
-        
+        self._setupAxes(ax)
+        legend = self._drawData(ax, *data)
+        self._decorateAxes(ax, self.title, legend)
+    
+    def _renderCandidates(self, item, size: tuple, share: float, costs: dict) -> list:
+        if not isinstance(item, (self.LineData, self.LiveData)):
+            return []
+        x = item.x
+        count = len(x)
+        candidates = [('plain', count, {"vertex": count})]
+        if (count > 4 * size[0] and np.issubdtype(x.dtype, np.number) and np.issubdtype(item.y.dtype, np.number)
+                and np.all(x[1:] >= x[:-1])):
+            ## first, min, max & last point of each pixel column: the same picture of line
+            candidates.append(('downsample', 4 * size[0], {"vertex": 4 * size[0]}))
+        return candidates
+    
+    def _drawData(self, ax, *data: LineData):
+        """
+            This method draws sets of source data into the axes
+            
+            :return: True if any set of data has a legend label
+        """
+        legend = False
         for item in data:
-            if isinstance(item, self.LineData):
-                if item.dataset is not None:
-                    x = [value[0] for value in item.dataset if self.is_sequence(value) and len(value) == 2]
-                    y = [value[1] for value in item.dataset if self.is_sequence(value) and len(value) == 2]
+            if isinstance(item, (self.LineData, self.LiveData)):
+                strategy, drawn = self._itemStrategy(item)
+                x, y = item.x, item.y
+                if strategy == 'downsample':
+                    x, y = ChartDataHelper.data_decimate(x, y, drawn // 4)
                 if item.label is not None:
                     ax.plot(x, y, label=item.label, color=item.color)
                     legend = True
                 else:
                     ax.plot(x, y, color=item.color)
-        
-        min_X, max_X = plt.xlim()
-        min_Y, max_Y = plt.ylim()
-        
-        if hasattr(self, 'imgbackground') and self.imgbackground is not None:
-            self.showbgimage( (min_X, max_X, min_Y, max_Y) )
-            
-        if self.title is not None:
-            plt.title(self.title, color = self.fontcolor)
-        if self.xlabel is not None:
-            plt.xlabel(self.xlabel, color = self.fontcolor)
-        if self.ylabel is not None:
-            plt.ylabel(self.ylabel, color = self.fontcolor)
-        if legend:
-            plt.legend()
-        
-        if self.grid:
-            plt.grid(True)
-        else:
-            plt.grid(False)
-            
-        if not self.ticks:
-            plt.xticks([])
-            plt.yticks([])
-        else:
-            ax.tick_params(axis = "x", colors = self.fontcolor)
-            ax.tick_params(axis = "y", colors = self.fontcolor)
-        
-        if hasattr(self, 'filename') and self.filename is not None:
-            plt.savefig(self.filename)
-        else:
-            plt.show()
+                if getattr(item, 'time', False):
+                    self._timeAxis(ax)
+        return legend
 
 class Hist(ChartBuilder):
     """ 
@@ -406,22 +1349,22 @@ class Hist(ChartBuilder):
         hist_title: Union[str, None]
         color: str
         
-        __colors = [*mcolors.BASE_COLORS.keys(), *mcolors.CSS4_COLORS.keys()]
+        __slots__ = ('values', 'step', 'hist_title', 'color')
         
         def __init__(self, dataset: Union[list, tuple], step: int = 10, hist_title = None, color = None):
             """ 
                 Creates an instance of an object HistData 
                 
                 :param dataset: Source data sequence
-                :param step: step for histogramm bins
+                :param step: step for histogramm bins (int or float)
                 :param hist_title: title of diagramm
                 :param color: color for this dataset
             """
             self.values = list(dataset)
             self.step = step
             self.hist_title = hist_title
-            if color is None or color not in (self.__colors):
-                color = self.__colors[random.randint(0,len(self.__colors)-1)]
+            if color is None or not _is_color(color):
+                color = _random_color()
             self.color = color
             
     def Plot(self, *data: HistData):
@@ -430,67 +1373,29 @@ class Hist(ChartBuilder):
             
             :param *data: one or more sets of source data
         """
-        legend = False
-        
-        diag_cnt = 0
-        for item in data:
-            if isinstance(item, self.HistData):
-                diag_cnt += 1
-          
-        fig = plt.figure(dpi = self.dpi, figsize = (self.width / self.dpi, diag_cnt * self.height / self.dpi) )
-        if hasattr(self, 'facecolor') and self.facecolor is not None:
-            fig.set(facecolor = self.facecolor)
-            fig.set(alpha = self.facecolor_alpha)
-        
+        data = [item for item in data if isinstance(item, self.HistData)]
+        fig = self._createFigure(len(data))
+        self._plotFigure(fig, *data)
+        self._save(fig)
+    
+    def _plotFigure(self, fig, *data: HistData):
+        """ This method biuld diagramm(s) in the figure (or in the cell of Dashboard) """
+        data = [item for item in data if isinstance(item, self.HistData)]
         fig.subplots_adjust(**self.margins)
-        
-        axs_cnt = 1
-        for item in data:
-            if isinstance(item, self.HistData):
-                ax = fig.add_subplot(diag_cnt, 1, axs_cnt)
-                if hasattr(self, 'bgcolor') and self.bgcolor is not None:
-                    ax.set(facecolor = self.bgcolor)
-                    ax.set(alpha = self.bgcolor_alpha)
-                
-                max_value = max(item.values)
-                min_value = min(item.values)
-                bins = [i for i in range(min_value-1, max_value+item.step, item.step)]
-                ax.hist(item.values, bins , histtype='bar', rwidth=0.8, color=item.color)
-                
-                min_X, max_X = plt.xlim()
-                min_Y, max_Y = plt.ylim()
-                        
-                if hasattr(self, 'imgbackground') and self.imgbackground is not None:
-                    self.showbgimage( (min_X, max_X, min_Y, max_Y) )
-                
-                if self.grid:
-                    ax.grid(True)
-                else:
-                    ax.grid(False)
-                
-                if item.hist_title is not None:
-                    plt.title(item.hist_title, color = self.fontcolor)
-                if self.xlabel is not None:
-                    plt.xlabel(self.xlabel, color = self.fontcolor)
-                if self.ylabel is not None:
-                    plt.ylabel(self.ylabel, color = self.fontcolor)
-                
-                if not self.ticks:
-                    plt.xticks([])
-                    plt.yticks([])
-                else:
-                    ax.tick_params(axis = "x", colors = self.fontcolor)
-                    ax.tick_params(axis = "y", colors = self.fontcolor)
-                
-                axs_cnt += 1
-        
+        for i, item in enumerate(data):
+            ax = fig.add_subplot(len(data), 1, i + 1)
+            self._setupAxes(ax)
+            self._drawData(ax, item)
+            self._decorateAxes(ax, item.hist_title)
         if self.title is not None:
             fig.suptitle(self.title, color = self.fontcolor)
-            
-        if hasattr(self, 'filename') and self.filename is not None:
-            plt.savefig(self.filename)
-        else:
-            plt.show()
+    
+    def _drawData(self, ax, item: HistData):
+        """ This method draws set of source data into the axes """
+        max_value = max(item.values)
+        min_value = min(item.values)
+        bins = np.arange(min_value-1, max_value+item.step, item.step) ## the same bins as range() for integers, float values too
+        ax.hist(item.values, bins , histtype='bar', rwidth=0.8, color=item.color)
 
 class Bar(ChartBuilder):
     """ 
@@ -500,32 +1405,82 @@ class Bar(ChartBuilder):
     """
     class BarData():
         """ This class describe data structure for Bar diagramm """
-        x_values: list
-        y_values: list
+        xy: np.ndarray ## [[x1,x2,...],[y1,y2,...]], sorted by x
+        dropped: int ## count of malformed points excluded from dataset
         bar_title: Union[str, None]
         color: str
+        time: Union[bool, str] ## x values are timestamps (stored as date numbers of matplotlib)
+        width: float ## width of bar in units of x values (days for timestamps)
         
-        __colors = [*mcolors.BASE_COLORS.keys(), *mcolors.CSS4_COLORS.keys()]
+        __slots__ = ('xy', 'dropped', 'bar_title', 'color', 'time', 'width')
         
-        def __init__(self, dataset: Union[list, tuple], bar_title = None, color = None):
+        def __init__(self, dataset: Union[list, tuple], bar_title = None, color = None, time: Union[bool, str, None] = None,
+                     bucket = None, aggregate: str = 'sum'):
             """ 
                 Creates an instance of an object BarData 
                 
                 :param dataset: Source data sequence
                 :param bar_title: title of diagramm
                 :param color: color for this dataset 
+                :param time: None - detect timestamps (datetime, datetime64) in x values, False - x values are not timestamps,
+                    's', 'ms', 'us', 'ns' - x values are epoch numbers in this unit
+                :param bucket: group timestamps into buckets of this width ('15m', '1h', '1D', timedelta etc.), one bar per bucket
+                :param aggregate: value of bar in bucket: 'sum', 'count', 'mean', 'min' or 'max' of values
             """
-            dataset = ChartDataHelper.data_sort_by_x(list(dataset))
-            x_values, y_values = [], []
-            for item in dataset:
-                x_values.append(item[0])
-                y_values.append(item[1])
-            self.y_values = y_values
-            self.x_values = x_values
+            xy, self.dropped = ChartDataHelper.data_split_xy(dataset)
+            if time is False or (time is None and not _is_time(xy[0])):
+                xy, time = ChartDataHelper.data_sort_xy(xy), False
+            else:
+                xy, dropped, time = ChartDataHelper.data_prepare_xy(xy[0], xy[1], time)
+                self.dropped += dropped
+            self.__setXY(xy, time, bucket, aggregate)
             self.bar_title = bar_title
-            if color is None or color not in (self.__colors):
-                color = self.__colors[random.randint(0,len(self.__colors)-1)]
+            if color is None or not _is_color(color):
+                color = _random_color()
             self.color = color
+            if self.dropped:
+                warnings.warn(f"BarData '{bar_title}': {self.dropped} malformed point(s) dropped")
+        
+        @classmethod
+        def fromArrays(cls, x, y, bar_title = None, color = None, time: Union[bool, str, None] = None, bucket = None, aggregate: str = 'sum'):
+            """ 
+                Creates an instance of an object BarData from arrays of x values & y values (without list of points)
+                
+                :param x: x values (numbers, datetime64 or epoch numbers)
+                :param y: y values
+                :param bar_title: title of diagramm
+                :param color: color for this dataset 
+                :param time, bucket, aggregate: see __init__
+            """
+            item = cls([], bar_title, color, False)
+            xy, item.dropped, time = ChartDataHelper.data_prepare_xy(np.asarray(x), np.asarray(y), time)
+            item.__setXY(xy, time, bucket, aggregate)
+            if item.dropped:
+                warnings.warn(f"BarData '{bar_title}': {item.dropped} point(s) without timestamp dropped")
+            return item
+        
+        def __setXY(self, xy: np.ndarray, time: Union[bool, str], bucket, aggregate: str):
+            self.time = time
+            self.width = 0.8
+            if time and bucket is not None:
+                xy, days = ChartDataHelper.data_time_bucket(xy, bucket, aggregate)
+                self.width = 0.8 * days
+            elif time and len(xy[0]) > 1: ## bars of 0.8 day are too wide for timestamps within a day
+                steps = np.diff(xy[0])
+                steps = steps[steps > 0]
+                if len(steps):
+                    self.width = 0.8 * min(1.0, float(steps.min()))
+            self.xy = xy
+        
+        @property
+        def x_values(self):
+            """ Contiguous array of x values """
+            return self.xy[0]
+        
+        @property
+        def y_values(self):
+            """ Contiguous array of y values """
+            return self.xy[1]
             
     def Plot(self, *data: BarData):
         """
@@ -533,69 +1488,64 @@ class Bar(ChartBuilder):
             
             :param *data: one or more sets of source data
         """
-        legend = False
-        
-        diag_cnt = 0
-        for item in data:
-            if isinstance(item, self.BarData):
-                diag_cnt += 1
-          
-        fig = plt.figure(dpi = self.dpi, figsize = (self.width / self.dpi, diag_cnt * self.height / self.dpi) )
-        if hasattr(self, 'facecolor') and self.facecolor is not None:
-            fig.set(facecolor = self.facecolor)
-            fig.set(alpha = self.facecolor_alpha)
-        
+        data = [item for item in data if isinstance(item, self.BarData)]
+        fig = self._createFigure(len(data))
+        self._plotFigure(fig, *data)
+        self._save(fig)
+    
+    def _plotFigure(self, fig, *data: BarData):
+        """ This method biuld diagramm(s) in the figure (or in the cell of Dashboard) """
+        data = [item for item in data if isinstance(item, self.BarData)]
+        self.render_plan = self.planRender(*data)
         fig.subplots_adjust(**self.margins)
-        
-        axs_cnt = 1
-        for item in data:
-            if isinstance(item, self.BarData):
-                ax = fig.add_subplot(diag_cnt, 1, axs_cnt)
-                if hasattr(self, 'bgcolor') and self.bgcolor is not None:
-                    ax.set(facecolor = self.bgcolor)
-                    ax.set(alpha = self.bgcolor_alpha)
-                
-                ax.bar(item.x_values, item.y_values, color=item.color)
-                
-                min_X, max_X = plt.xlim()
-                min_Y, max_Y = plt.ylim()
-                        
-                if hasattr(self, 'imgbackground') and self.imgbackground is not None:
-                    self.showbgimage( (min_X, max_X, min_Y, max_Y) )
-                
-                if self.grid:
-                    plt.grid(True)
-                else:
-                    plt.grid(False)
-                
-                if item.bar_title is not None:
-                    plt.title(item.bar_title, color = self.fontcolor)
-                    
-                if self.xlabel is not None:
-                    plt.xlabel(self.xlabel, color = self.fontcolor)
-                if self.ylabel is not None:
-                    plt.ylabel(self.ylabel, color = self.fontcolor)
-                    
-                if not self.ticks:
-                    plt.xticks([])
-                    plt.yticks([])
-                else:
-                    ax.tick_params(axis = "x", colors = self.fontcolor)
-                    ax.tick_params(axis = "y", colors = self.fontcolor)
-                    if self.custom_x_ticks is not None:
-                        if len(self.custom_x_ticks) == len(item.x_values):
-                            plt.xticks(item.x_values, self.custom_x_ticks)
-                        else:
-                            plt.xlabel(f'Error: count of custom x-ticks and count of values doesn\'t match')
-                axs_cnt += 1
-        
+        for i, item in enumerate(data):
+            ax = fig.add_subplot(len(data), 1, i + 1)
+            self._setupAxes(ax)
+            self._drawData(ax, item)
+            self._decorateAxes(ax, item.bar_title)
+            self._customTicks(ax, item)
         if self.title is not None:
             fig.suptitle(self.title, color = self.fontcolor)
-            
-        if hasattr(self, 'filename') and self.filename is not None:
-            plt.savefig(self.filename)
-        else:
-            plt.show()
+    
+    def _renderCandidates(self, item, size: tuple, share: float, costs: dict) -> list:
+        if not isinstance(item, self.BarData):
+            return []
+        count = len(item.x_values)
+        candidates = [('plain', count, {"bar": count})]
+        if np.issubdtype(item.xy.dtype, np.number):
+            candidates.append(('collection', count, {"polygon": count}))
+            if count > size[0] and self.custom_x_ticks is None:
+                ## max & min value of each pixel column
+                candidates.append(('downsample', size[0], {"polygon": size[0]}))
+        return candidates
+    
+    def _drawData(self, ax, item: BarData):
+        """ This method draws set of source data into the axes """
+        strategy, drawn = self._itemStrategy(item)
+        if item.time:
+            self._timeAxis(ax)
+        if strategy == 'plain':
+            ax.bar(item.x_values, item.y_values, width=item.width, color=item.color)
+            return
+        x, y, width = item.x_values, item.y_values, item.width
+        if strategy == 'downsample':
+            x, y, width = ChartDataHelper.data_envelope(x, y, drawn, width)
+        left, right = x - width / 2, x + width / 2
+        zero = np.zeros_like(y)
+        bars = PolyCollection(np.stack((np.stack((left, zero), 1), np.stack((left, y), 1), 
+                                        np.stack((right, y), 1), np.stack((right, zero), 1)), 1),
+                              facecolors = item.color, edgecolors = 'none', linewidths = 0)
+        bars.sticky_edges.y.append(0)
+        ax.add_collection(bars)
+        ax.autoscale_view()
+    
+    def _customTicks(self, ax, item: BarData):
+        """ This method set custom signs for ticks on x-axis """
+        if self.ticks and self.custom_x_ticks is not None:
+            if len(self.custom_x_ticks) == len(item.x_values):
+                ax.set_xticks(item.x_values, self.custom_x_ticks)
+            else:
+                ax.set_xlabel(f'Error: count of custom x-ticks and count of values doesn\'t match')
 
 class Pie(ChartBuilder):
     """ 
@@ -616,6 +1566,8 @@ class Pie(ChartBuilder):
         minvalue: float
         pie_title: Union[str, None]
         
+        __slots__ = ('values', 'labels', 'minvalue', 'pie_title')
+        
         def __init__(self, dataset: Union[list, tuple], pie_title = None, minpercent: int = 0):
             """ 
                 Creates an instance of an object PieData 
@@ -666,59 +1618,436 @@ class Pie(ChartBuilder):
             
             :param *data: one or more sets of source data
         """
-        diag_cnt = 0
-        for item in data:
-            if isinstance(item, self.PieData):
-                diag_cnt += 1
-          
-        fig = plt.figure(dpi = self.dpi, figsize = (self.width / self.dpi, diag_cnt * self.height / self.dpi) )
-        if hasattr(self, 'facecolor') and self.facecolor is not None:
-            fig.set(facecolor = self.facecolor)
-            fig.set(alpha = self.facecolor_alpha)
+        data = [item for item in data if isinstance(item, self.PieData)]
+        fig = self._createFigure(len(data))
+        self._plotFigure(fig, *data)
+        self._save(fig)
+    
+    def _plotFigure(self, fig, *data: PieData):
+        """ This method biuld diagramm(s) in the figure (or in the cell of Dashboard) """
+        data = [item for item in data if isinstance(item, self.PieData)]
+        if hasattr(self, 'bgcolor') and self.bgcolor is not None:
+            fig.set(facecolor = self.bgcolor)
+            fig.set(alpha = self.bgcolor_alpha)
+        for i, item in enumerate(data):
+            ax = fig.add_subplot(len(data), 1, i + 1)
+            self._drawData(ax, item)
+            self._decorateAxes(ax, item.pie_title)
+        if self.title is not None:
+            fig.suptitle(self.title, color = self.fontcolor)
+    
+    def _drawData(self, ax, item: PieData):
+        """ This method draws set of source data into the axes """
+        if self.custom_item_names is not None and len(self.custom_item_names) == len(item.labels):
+            for i in range(len(item.labels)):
+                item.labels[i] = self.custom_item_names[i]
+        filtered_dataset = [ (item.values[i], item.labels[i]) for i in range(len(item.values)) if item.values[i] >= item.minvalue]
+        item.values = [value[0] for value in filtered_dataset]
+        item.labels = [value[1] for value in filtered_dataset]
         
-        axs_cnt = 1
-        for item in data:
-            if isinstance(item, self.PieData):
-                if self.custom_item_names is not None and len(self.custom_item_names) == len(item.labels):
-                    for i in range(len(item.labels)):
-                        item.labels[i] = self.custom_item_names[i]
-                filtered_dataset = [ (item.values[i], item.labels[i]) for i in range(len(item.values)) if item.values[i] >= item.minvalue]
-                item.values = [value[0] for value in filtered_dataset]
-                item.labels = [value[1] for value in filtered_dataset]
-                
-                total = sum(item.values)
-                labels = [f"{n} ({v/total:.1%})" for n,v in zip(item.labels, item.values)]
-                
-                ax = fig.add_subplot(diag_cnt, 1, axs_cnt)
-                if hasattr(self, 'bgcolor') and self.bgcolor is not None:
-                    fig.set(facecolor = self.bgcolor)
-                    fig.set(alpha = self.bgcolor_alpha)
-                
-                ax.pie(item.values, autopct='%1.1f%%', shadow=True, startangle=90)
-                ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle. 
-                ax.legend(bbox_to_anchor = (-0.16, 0.45, 0.25, 0.25), loc = 'best', labels = labels )
-                
-                min_X, max_X = plt.xlim()
-                min_Y, max_Y = plt.ylim()
-                
-                if hasattr(self, 'imgbackground') and self.imgbackground is not None:
-                    self.showbgimage( (min_X, max_X, min_Y, max_Y), 'equal' )
-                
-                if item.pie_title is not None:
-                    plt.title(item.pie_title, color = self.fontcolor)
+        total = sum(item.values)
+        labels = [f"{n} ({v/total:.1%})" for n,v in zip(item.labels, item.values)]
+        
+        ax.pie(item.values, autopct='%1.1f%%', shadow=True, startangle=90)
+        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle. 
+        ax.legend(bbox_to_anchor = (-0.16, 0.45, 0.25, 0.25), loc = 'best', labels = labels )
+    
+    def _decorateAxes(self, ax, title = None, legend: bool = False):
+        """ Override an inherited method _decorateAxes: background image with equal aspect & title only """
+        if hasattr(self, 'imgbackground') and self.imgbackground is not None:
+            min_X, max_X = ax.get_xlim()
+            min_Y, max_Y = ax.get_ylim()
+            self.showbgimage( (min_X, max_X, min_Y, max_Y), 'equal', ax )
+        if title is not None:
+            ax.set_title(title, color = self.fontcolor)
+
+class QuantileSketch():
+    """ 
+        Mergeable quantile sketch (KLL) with bounded memory: values are added by chunks, sketches built from 
+        different chunks (or in different processes) are merged before rendering. 
+        Sketch keeps at most 3 * k values, rank error of quantiles is about 1.7 / k & stays under 3 / k (1.5% for k = 200)
+        
+        property: k: accuracy parameter (size of the largest compactor)
+        property: count: count of added values
+        property: min: minimum of added values
+        property: max: maximum of added values
+        
+        method: update(values): add values (sequence or array)
+        method: merge(other): add values of another sketch
+        method: quantile(q): return q-quantile (0 <= q <= 1)
+        method: quantiles(qs): return array of quantiles
+        method: size(): return count of stored values
+    """
+    __slots__ = ('k', 'count', 'min', 'max', '_levels', '_rng')
+    
+    def __init__(self, k: int = 200, seed: Union[int, None] = None):
+        """
+            Creates an instance of an object QuantileSketch
+            
+            :param k: accuracy parameter
+            :param seed: seed of random generator (compaction offsets)
+        """
+        self.k = max(8, int(k))
+        self.count = 0
+        self.min = float('nan')
+        self.max = float('nan')
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+    
+    def update(self, values):
+        """ This method add values (NaN values are ignored), return sketch itself """
+        values = np.asarray(values, dtype = float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.count += values.size
+            self.min = float(np.nanmin([self.min, values.min()]))
+            self.max = float(np.nanmax([self.max, values.max()]))
+            self._levels[0] = np.concatenate((self._levels[0], values))
+            self.__compress()
+        return self
+    
+    def merge(self, other: 'QuantileSketch'):
+        """ This method add values of another sketch, return sketch itself """
+        if other.count:
+            self.count += other.count
+            self.min = float(np.nanmin([self.min, other.min]))
+            self.max = float(np.nanmax([self.max, other.max]))
+            while len(self._levels) < len(other._levels):
+                self._levels.append(np.empty(0))
+            for h, level in enumerate(other._levels):
+                self._levels[h] = np.concatenate((self._levels[h], level))
+            self.__compress()
+        return self
+    
+    def size(self) -> int:
+        """ This method return count of stored values """
+        return sum(len(level) for level in self._levels)
+    
+    def quantile(self, q: float) -> float:
+        """ This method return q-quantile (0 <= q <= 1), NaN for empty sketch """
+        return float(self.quantiles([q])[0])
+    
+    def quantiles(self, qs) -> np.ndarray:
+        """ This method return array of quantiles for sequence of q (0 <= q <= 1) """
+        qs = np.clip(np.asarray(qs, dtype = float), 0.0, 1.0)
+        if not self.count:
+            return np.full(qs.shape, np.nan)
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)])
+        order = np.argsort(values, kind = 'stable')
+        values, ranks = values[order], np.cumsum(weights[order])
+        idx = np.minimum(np.searchsorted(ranks, qs * ranks[-1], side = 'left'), len(values) - 1)
+        result = values[idx]
+        result[qs <= 0.0] = self.min
+        result[qs >= 1.0] = self.max
+        return result
+    
+    def __capacity(self, h: int) -> int:
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self._levels) - 1 - h))))
+    
+    def __compress(self):
+        """ This method compacts levels which exceed their capacity: sorted values of level are halved & promoted to the next level """
+        compacted = True
+        while compacted:
+            compacted = False
+            for h in range(len(self._levels)):
+                level = self._levels[h]
+                if len(level) <= self.__capacity(h):
+                    continue
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                level = np.sort(level)
+                odd = len(level) % 2 ## odd value stays on this level
+                self._levels[h] = level[:odd]
+                promoted = level[odd + self._rng.integers(2)::2]
+                self._levels[h + 1] = np.concatenate((self._levels[h + 1], promoted))
+                compacted = True
+                break
+
+class Box(ChartBuilder):
+    """ 
+        ChartBuilder implementation for Box (box & whiskers) diagramm of quantiles.
+        Sets of source data are quantile sketches, so any count of values may be summarised 
+        by chunks (and in several processes) in bounded memory before rendering
+        
+        method: Plot(*data): biuld diagramm and show it (or save into the file)
+    """
+    class BoxData():
+        """ This class describe data structure for Box diagramm """
+        sketch: QuantileSketch
+        label: Union[str, None]
+        color: str
+        whiskers: tuple ## percentiles of whiskers ends
+        
+        __slots__ = ('sketch', 'label', 'color', 'whiskers')
+        
+        def __init__(self, dataset: Union[QuantileSketch, list, tuple], label = None, color = None, whiskers: tuple = (5, 95)):
+            """ 
+                Creates an instance of an object BoxData
                 
-                axs_cnt += 1
+                :param dataset: quantile sketch (or sequence of values)
+                :param label: name of dataset
+                :param color: color for this dataset
+                :param whiskers: percentiles of whiskers ends (low, high), default (5, 95)
+            """
+            if not isinstance(dataset, QuantileSketch):
+                dataset = QuantileSketch().update(dataset)
+            self.sketch = dataset
+            self.label = label
+            if color is None or not _is_color(color):
+                color = _random_color()
+            self.color = color
+            self.whiskers = tuple(whiskers)
+        
+        def stats(self) -> dict:
+            """ This method return statistics of box (see matplotlib Axes.bxp) """
+            whislo, q1, med, q3, whishi = self.sketch.quantiles([self.whiskers[0] / 100, 0.25, 0.5, 0.75, self.whiskers[1] / 100])
+            return {
+                "label"  : self.label if self.label is not None else '',
+                "whislo" : whislo,
+                "q1"     : q1,
+                "med"    : med,
+                "q3"     : q3,
+                "whishi" : whishi,
+                "fliers" : [],
+            }
+    
+    def Plot(self, *data: BoxData):
+        """
+            This method biuld diagramm and show it (or save into the file)
+            
+            :param *data: one or more sets of source data
+        """
+        fig = self._createFigure()
+        self._plotFigure(fig, *data)
+        self._save(fig)
+    
+    def _plotFigure(self, fig, *data: BoxData):
+        """ This method biuld diagramm in the figure (or in the cell of Dashboard) """
+        fig.subplots_adjust(**self.margins)
+        ax = fig.add_subplot(1,1,1)
+        self._setupAxes(ax)
+        self._drawData(ax, *data)
+        self._decorateAxes(ax, self.title)
+    
+    def _drawData(self, ax, *data: BoxData):
+        """ This method draws sets of source data into the axes """
+        data = [item for item in data if isinstance(item, self.BoxData) and item.sketch.count]
+        if data:
+            boxes = ax.bxp([item.stats() for item in data], showfliers = False, patch_artist = True, medianprops = {'color': 'black'})
+            for box, item in zip(boxes['boxes'], data):
+                box.set_facecolor(item.color)
+
+class Dashboard(ChartBuilder):
+    """ 
+        ChartBuilder implementation for several diagramms (Scatter, LineGraph, Hist, Bar, Pie, Box) in one image.
+        Each diagramm is placed into the cell of grid (cell size = width x height), figure, face color,
+        background image & file to save are shared by all diagramms, so image is rendered & saved once
+        
+        property: cols: count of cells in one row of grid, default 2
+        property: charts: list of diagramms with their sets of source data
+        
+        method: addChart(chart, *data): add diagramm with its sets of source data into the next cell of grid
+        method: Plot(): biuld all diagramms and show them (or save into the file)
+    """
+    cols: int = 2
+    charts: list
+    
+    def __init__(self, title = None, cols: int = 2):
+        """
+            Creates an instance of an object 
+            
+            :param title: supertitle for all diagramms
+            :param cols: count of cells in one row of grid
+        """
+        super().__init__(title)
+        self.cols = cols
+        self.charts = []
+    
+    def addChart(self, chart: ChartBuilder, *data):
+        """
+            This method add diagramm with its sets of source data into the next cell of grid
+            
+            :param chart: diagramm (Scatter, LineGraph, Hist, Bar, Pie, Box)
+            :param *data: one or more sets of source data for this diagramm
+        """
+        if not hasattr(chart, '_plotFigure'):
+            raise TypeError(f"{type(chart).__name__} can't be placed into the cell of Dashboard")
+        self.charts.append((chart, data))
+    
+    def Plot(self):
+        """ This method biuld all diagramms and show them (or save into the file) """
+        cols = max(1, min(self.cols, len(self.charts)))
+        rows = max(1, -(-len(self.charts) // cols))
+        fig = self._createFigure(rows, cols)
+        
+        if hasattr(self, 'imgbackground') and self.imgbackground is not None:
+            ax = fig.add_axes((0, 0, 1, 1), zorder = -1)
+            ax.set_axis_off()
+            self.showbgimage((0, 1, 0, 1), ax = ax)
+        
+        cells = fig.subfigures(rows, cols, squeeze = False, facecolor = 'none')
+        for (chart, data), cell in zip(self.charts, cells.flat):
+            chart._plotFigure(cell, *data)
+        self.render_plan = {"charts": [chart.render_plan for chart, data in self.charts]}
         
         if self.title is not None:
             fig.suptitle(self.title, color = self.fontcolor)
+        self._save(fig)
+
+def warmup(backgrounds: Union[list, tuple, None] = None, width: int = 800, height: int = 600, dpi: int = 90):
+    """
+        This function prepares fresh process for rendering (e.g. worker of process pool): loads font cache,
+        initializes backend & text layout caches by building (and discarding) small diagramm of each type,
+        decodes background images & caches them scaled for diagramms of given size
+        
+        :param backgrounds: list of background image files used by diagramms
+        :param width: width of diagramms with background image
+        :param height: height of diagramms with background image
+        :param dpi: resolution of diagramms with background image
+        :return: dict with seconds of warming up
+    """
+    start = time.perf_counter()
+    font_manager.findfont(font_manager.FontProperties())
+    values = [1, 2, 2, 3, 3, 3]
+    points = [(1, 1), (2, 4), (3, 9)]
+    charts = [
+        (Scatter('Title', 'x', 'y'), lambda p: [p.ScatterData(points, 'Label', 'r')]),
+        (LineGraph('Title', 'x', 'y'), lambda p: [p.LineData(points, 'Label', 'g')]),
+        (Hist('Title', 'x', 'y'), lambda p: [p.HistData(values, 1, 'Title', 'b')]),
+        (Bar('Title', 'x', 'y'), lambda p: [p.BarData(points, 'Title', 'c')]),
+        (Pie('Title'), lambda p: [p.PieData([('a', 1), ('b', 2)], 'Title')]),
+        (Box('Title', 'x', 'y'), lambda p: [p.BoxData(values, 'Label', 'm')]),
+    ]
+    for chart, data in charts:
+        chart.setSize(160, 120)
+        chart.setEncoding('fast')
+        chart.fileToSave(io.BytesIO())
+        chart.Plot(*data(chart))
+    for filename in backgrounds or []:
+        chart = Scatter()
+        chart.setSize(width, height)
+        chart.dpi = dpi
+        chart.setBgImage(filename)
+        chart.setEncoding('fast')
+        chart.fileToSave(io.BytesIO())
+        chart.Plot(chart.ScatterData(points, None, 'k'))
+    return {"seconds": time.perf_counter() - start}
+
+def worker_pool(processes: Union[int, None] = None, backgrounds: Union[list, tuple, None] = None, **kwargs):
+    """
+        This function creates process pool for rendering, each worker runs warmup() before the first task
+        
+        :param processes: count of worker processes, default count of CPU
+        :param backgrounds: list of background image files for warmup()
+        :param **kwargs: other arguments of warmup() (width, height, dpi)
+        :return: multiprocessing.Pool
+    """
+    return multiprocessing.Pool(processes, initializer = functools.partial(warmup, backgrounds, **kwargs))
+
+class SpatialIndex():
+    """ 
+        Index of points for repeated rectangular crop queries (e.g. viewports of map over the same track set):
+        points are sorted once by cells of uniform grid, so points of one row of cells lie in one contiguous slice.
+        Query reads only slices of rows overlapping the rectangle & checks only these points (with the same strict
+        inequalities as data_crop), instead of scanning all points
         
-        if hasattr(self, 'filename') and self.filename is not None:
-            plt.savefig(self.filename)
+        property: count: count of indexed points
+        property: bounds: (min_x, min_y, max_x, max_y) of indexed points
+        property: cells: count of grid cells (cols, rows)
+        
+        method: query(min_x, min_y, max_x, max_y): return indexes of points inside rectangle (in source order)
+        method: crop(min_x, min_y, max_x, max_y): return points inside rectangle (array n x 2 | ScatterData)
+    """
+    __slots__ = ('count', 'bounds', 'cells', '_item', '_points', '_x', '_y', '_order', '_starts', '_size')
+    
+    def __init__(self, source, cell_points: int = 64):
+        """
+            Creates an instance of an object SpatialIndex
+            
+            :param source: points: 2-d array (n x 2), sequence of (x, y) points or Scatter.ScatterData
+            :param cell_points: average count of points in one cell of grid
+        """
+        self._item = source if isinstance(source, Scatter.ScatterData) else None
+        if self._item is not None:
+            xy = source.xy
+        elif isinstance(source, np.ndarray) and source.ndim == 2 and source.shape[1] == 2:
+            xy = source.T
         else:
-            plt.show()
+            xy, dropped = ChartDataHelper.data_split_xy(source)
+        self._points = xy.T ## source points (n x 2) for crop
+        x, y = np.asarray(xy[0], dtype = float), np.asarray(xy[1], dtype = float)
+        valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y)) ## NaN can't be inside any rectangle
+        x, y = x[valid], y[valid]
+        self.count = len(x)
+        if self.count == 0:
+            self.bounds = (0.0, 0.0, 0.0, 0.0)
+            self.cells = (1, 1)
+            self._x, self._y, self._order, self._starts, self._size = x, y, valid, np.zeros(2, dtype = np.intp), (1.0, 1.0)
+            return
+        self.bounds = (float(x.min()), float(y.min()), float(x.max()), float(y.max()))
+        width, height = self.bounds[2] - self.bounds[0], self.bounds[3] - self.bounds[1]
+        cells = max(1, min(self.count // max(1, cell_points), 2 ** 22))
+        ratio = width / height if width > 0 and height > 0 else 1.0
+        cols = max(1, min(cells, int(np.ceil(np.sqrt(cells * ratio))))) if width > 0 else 1
+        rows = max(1, cells // cols) if height > 0 else 1
+        self.cells = (cols, rows)
+        self._size = (width / cols or 1.0, height / rows or 1.0)
+        col = np.minimum(((x - self.bounds[0]) / self._size[0]).astype(np.intp), cols - 1)
+        row = np.minimum(((y - self.bounds[1]) / self._size[1]).astype(np.intp), rows - 1)
+        cell = row * cols + col
+        order = np.argsort(cell, kind = 'stable') ## source order inside each cell
+        self._starts = np.r_[0, np.cumsum(np.bincount(cell, minlength = cols * rows))]
+        self._x, self._y = x[order], y[order]
+        self._order = valid[order]
+    
+    def query(self, min_x, min_y, max_x, max_y) -> np.ndarray:
+        """
+            This method return indexes of points inside rectangle (min_x < x < max_x, min_y < y < max_y)
+            
+            :return: array of indexes of points in source (ascending)
+        """
+        if (self.count == 0 or not (min_x < max_x and min_y < max_y) 
+                or max_x <= self.bounds[0] or min_x >= self.bounds[2] or max_y <= self.bounds[1] or min_y >= self.bounds[3]):
+            return np.empty(0, dtype = np.intp)
+        cols, rows = self.cells
+        c0, c1 = (min(cols - 1, max(0, int((value - self.bounds[0]) // self._size[0]))) for value in (min_x, max_x))
+        r0, r1 = (min(rows - 1, max(0, int((value - self.bounds[1]) // self._size[1]))) for value in (min_y, max_y))
+        ## one contiguous slice of points per row of cells
+        first = np.arange(r0, r1 + 1) * cols
+        lo, hi = self._starts[first + c0], self._starts[first + c1 + 1]
+        lengths = hi - lo
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype = np.intp)
+        candidates = np.repeat(lo - np.cumsum(np.r_[0, lengths[:-1]]), lengths) + np.arange(total)
+        x, y = self._x[candidates], self._y[candidates]
+        inside = (x > min_x) & (x < max_x) & (y > min_y) & (y < max_y)
+        found = self._order[candidates[inside]]
+        if len(found) * 16 < len(self._points):
+            return np.sort(found)
+        ## large part of points: marking is cheaper than sorting
+        marks = np.zeros(len(self._points), dtype = bool)
+        marks[found] = True
+        return np.flatnonzero(marks)
+    
+    def crop(self, min_x, min_y, max_x, max_y):
+        """
+            This method return points inside rectangle (min_x < x < max_x, min_y < y < max_y), like data_crop
+            
+            :return: array of points (n x 2) in source order, or ScatterData (label, color, marker & values of source ScatterData)
+        """
+        indexes = self.query(min_x, min_y, max_x, max_y)
+        if self._item is None:
+            return self._points[indexes]
+        item = self._item
+        return Scatter.ScatterData(item.xy[:, indexes].T, item.label, item.color, item.marker, 
+                                   None if item.values is None else item.values[indexes], item.cmap, item.palette)
 
 class ChartDataHelper():
     """ This class contains auxiliary methods for data preprocessing """
+    time_units = {'s': 1.0, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9} ## seconds in unit of epoch numbers
+    
     @staticmethod
     def data_count(src_data: list):
         """
@@ -727,7 +2056,78 @@ class ChartDataHelper():
             :param src_data: Original sequence (list or tuple)
             :return: The sequence of tuples, contains (element, count of element)
         """
-        return set([(item, src_data.count(item)) for item in src_data])
+        if isinstance(src_data, np.ndarray):
+            src_data = src_data.tolist()
+        return set(Counter(src_data).items())
+    
+    @staticmethod
+    def data_count_chunks(chunks, step: Union[int, float, None] = None):
+        """
+            This method counts the number of repetitions for each value in a stream of chunks (see csv_read_chunks).
+            If step is set, values are grouped into bins [start_of_bin, start_of_bin + step) like a histogram,
+            so large files can be histogrammed without loading all values into memory
+            
+            :param chunks: Iterable of sequences (1-d arrays) of values
+            :param step: Width of bins, default None (count each value)
+            :return: The sequence of tuples, contains (element | start_of_bin, count of element)
+        """
+        counts = {}
+        for chunk in chunks:
+            values = np.asarray(chunk).ravel()
+            if values.size == 0:
+                continue
+            if step is not None:
+                values = np.floor_divide(values, step) * step
+            keys, key_counts = np.unique(values, return_counts = True)
+            for key, count in zip(keys.tolist(), key_counts.tolist()):
+                counts[key] = counts.get(key, 0) + count
+        return set(counts.items())
+    
+    @staticmethod
+    def csv_read_chunks(filename: str, columns: Union[list, tuple, None] = None, dtype = float, delimiter: Union[str, None] = None, 
+                        header: bool = True, chunk_size: int = 65536, encoding: str = 'utf-8'):
+        """
+            This method reads large CSV (TSV) file by chunks & yields typed arrays of the selected columns.
+            Empty fields are NaN (float values), malformed line raises ValueError with its number in file.
+            One selected column gives 1-d array of values (for HistData, data_count, data_count_chunks),
+            two or more columns give 2-d array of rows (for ScatterData, LineData, BarData, data_crop)
+            
+            :param filename: name of CSV (TSV) file
+            :param columns: selected columns (indexes or names from header), default all columns
+            :param dtype: type of values (float, int etc.), default float
+            :param delimiter: columns delimiter, default '\\t' for *.tsv files & ',' for other files
+            :param header: first line of file contains names of columns, default True
+            :param chunk_size: count of rows in one chunk
+            :param encoding: encoding of file
+            :return: Generator of numpy arrays
+        """
+        if delimiter is None:
+            delimiter = '\t' if filename.lower().endswith('.tsv') else ','
+        with open(filename, 'r', encoding = encoding, newline = '') as f:
+            names = []
+            if header:
+                names = [name.strip() for name in next(csv.reader([f.readline()], delimiter = delimiter), [])]
+            usecols = None
+            if columns is not None:
+                usecols = []
+                for column in columns:
+                    if isinstance(column, str):
+                        if column not in names:
+                            raise ValueError(f"Column '{column}' not found in {filename}")
+                        usecols.append(names.index(column))
+                    else:
+                        usecols.append(int(column))
+            ndmin = 1 if usecols is not None and len(usecols) == 1 else 2
+            first_line = 2 if header else 1
+            while True:
+                lines = list(itertools.islice(f, chunk_size))
+                if not lines:
+                    break
+                try:
+                    yield np.loadtxt(lines, delimiter = delimiter, usecols = usecols, dtype = dtype, ndmin = ndmin, quotechar = '"')
+                except ValueError: ## empty fields or malformed line: slow path for this chunk only
+                    yield _csv_parse(lines, delimiter, usecols, dtype, ndmin, filename, first_line)
+                first_line += len(lines)
         
     @staticmethod
     def data_sort_by_x(x_y_data: list):
@@ -739,6 +2139,221 @@ class ChartDataHelper():
         """
         return sorted(x_y_data, key=lambda v: v[0])
     
+    @staticmethod
+    def data_split_xy(x_y_data):
+        """
+            This method converts sequence of points into one contiguous block [[x1,x2,...],[y1,y2,...]]
+            (rows of block are contiguous arrays of x values & y values).
+            Malformed points (not a pair of values) are excluded & counted
+            
+            :param x_y_data: Original sequence (list, tuple, set or 2-d array of (x, y) points)
+            :return: block of x & y values, count of excluded points
+        """
+        if not isinstance(x_y_data, np.ndarray):
+            if not isinstance(x_y_data, (list, tuple)):
+                x_y_data = list(x_y_data)
+            ## short series of pairs: transposing by zip() is faster than asarray() of points (~2x for 10 points),
+            ## for long series asarray() wins (~1.8x for 1M points)
+            if len(x_y_data) <= 1000:
+                try:
+                    if sum(map(len, x_y_data)) == 2 * len(x_y_data):
+                        rows = tuple(zip(*x_y_data))
+                        if len(rows) == 2:
+                            xy = np.array(rows)
+                            if xy.dtype.kind in 'biuf':
+                                return xy.astype(float, copy = False), 0
+                except (TypeError, ValueError):
+                    pass
+        try:
+            points = np.asarray(x_y_data)
+        except (TypeError, ValueError):
+            points = None
+        if points is not None:
+            if points.size == 0:
+                return np.empty((2, 0)), 0
+            ## only real numbers go to float block, strings (e.g. names of bars '10', '07') stay as they are
+            if points.ndim == 2 and points.shape[1] == 2 and points.dtype.kind in 'biuf':
+                return np.ascontiguousarray(points.T, dtype = float), 0
+        valid = [value for value in x_y_data if _is_point(value)]
+        x = np.array([value[0] for value in valid])
+        y = np.array([value[1] for value in valid])
+        if x.dtype == y.dtype:
+            xy = np.array([x, y])
+        else: ## e.g. names of bars & numbers
+            xy = np.empty((2, len(valid)), dtype = object)
+            xy[0], xy[1] = x, y
+        return xy, len(x_y_data) - len(valid)
+    
+    @staticmethod
+    def data_sort_xy(xy: np.ndarray):
+        """
+            This method sort block of x & y values [[x1,x2,...],[y1,y2,...]] by x values.
+            Sorting is skipped if x values are already in ascending order
+            
+            :param xy: block of x & y values
+            :return: Sorted block
+        """
+        x = xy[0]
+        if len(x) < 2:
+            return xy
+        try:
+            if np.all(x[1:] >= x[:-1]):
+                return xy
+        except TypeError:
+            pass
+        order = np.argsort(x, kind = 'stable')
+        return np.ascontiguousarray(xy[:, order])
+    
+    @staticmethod
+    def data_time_to_num(x, unit: Union[str, None] = None):
+        """
+            This method converts timestamps into date numbers of matplotlib (days since matplotlib epoch) without per-element Python loop
+            
+            :param x: timestamps: datetime64 array, sequence of datetime (date) objects or epoch numbers
+            :param unit: unit of epoch numbers ('s', 'ms', 'us', 'ns'), None for datetime64 & datetime objects
+            :return: float array of date numbers, NaN for missing timestamps (NaT, None)
+        """
+        epoch = mdates.date2num(np.datetime64('1970-01-01')) ## 0.0 for default epoch of matplotlib
+        if unit is not None:
+            if unit not in ChartDataHelper.time_units:
+                raise ValueError(f"Unknown time unit '{unit}', expected one of {', '.join(ChartDataHelper.time_units)}")
+            seconds = np.asarray(x, dtype = float) * ChartDataHelper.time_units[unit]
+            return seconds / 86400 + epoch
+        x = np.asarray(x)
+        if x.dtype == object:
+            ## naive datetime objects: subtraction is several times faster than conversion by numpy
+            start, day = datetime.datetime(1970, 1, 1), datetime.timedelta(days = 1)
+            try:
+                return np.fromiter(((value - start) / day for value in x), float, len(x)) + epoch
+            except TypeError: ## date objects, timezone aware datetime objects, missing values
+                pass
+        if not np.issubdtype(x.dtype, np.datetime64):
+            with warnings.catch_warnings(): ## timezone aware datetime objects are converted to UTC
+                warnings.simplefilter('ignore', UserWarning)
+                x = x.astype('datetime64[us]')
+        return mdates.date2num(x)
+    
+    @staticmethod
+    def data_prepare_xy(x: np.ndarray, y: np.ndarray, time: Union[bool, str, None] = None):
+        """
+            This method makes block of x & y values [[x1,x2,...],[y1,y2,...]] sorted by x.
+            Timestamps are converted into date numbers, points without timestamp (NaT) are excluded & counted
+            
+            :param x: x values
+            :param y: y values
+            :param time: None - timestamps are detected by type of x values, False - x values are not timestamps,
+                's', 'ms', 'us', 'ns' - x values are epoch numbers in this unit
+            :return: block of x & y values, count of excluded points, time (True | unit of epoch numbers | False)
+        """
+        if len(x) != len(y):
+            raise ValueError(f"Count of x values ({len(x)}) and count of y values ({len(y)}) doesn't match")
+        if time is None:
+            time = _is_time(x)
+        if not time:
+            if x.dtype == y.dtype:
+                xy = np.array([x, y])
+            else:
+                xy = np.empty((2, len(x)), dtype = object)
+                xy[0], xy[1] = x, y
+            return ChartDataHelper.data_sort_xy(xy), 0, False
+        x = ChartDataHelper.data_time_to_num(x, time if isinstance(time, str) else None)
+        valid = ~np.isnan(x)
+        xy = np.array([x[valid], np.asarray(y, dtype = float)[valid]])
+        return ChartDataHelper.data_sort_xy(xy), len(x) - len(xy[0]), time
+    
+    @staticmethod
+    def data_time_delta(delta) -> float:
+        """
+            This method converts time interval into days (unit of date numbers)
+            
+            :param delta: timedelta64, timedelta, seconds or string like '30s', '15m', '1h', '1D', '1W'
+            :return: count of days
+        """
+        if isinstance(delta, str):
+            match = re.fullmatch(r'\s*(\d+)\s*(W|D|h|m|s|ms|us)\s*', delta)
+            if match is None:
+                raise ValueError(f"Unknown time interval '{delta}', expected number & unit (W, D, h, m, s, ms, us), e.g. '15m'")
+            delta = np.timedelta64(int(match.group(1)), match.group(2))
+        elif isinstance(delta, datetime.timedelta):
+            delta = np.timedelta64(delta)
+        elif not isinstance(delta, np.timedelta64):
+            delta = np.timedelta64(int(round(float(delta) * 1e6)), 'us')
+        days = delta / np.timedelta64(1, 'D')
+        if not days > 0:
+            raise ValueError(f"Time interval must be positive: {delta}")
+        return float(days)
+    
+    @staticmethod
+    def data_time_bucket(xy: np.ndarray, bucket, aggregate: str = 'sum'):
+        """
+            This method groups values into time buckets (e.g. sum of values per hour)
+            
+            :param xy: block of date numbers & values sorted by date numbers (see data_prepare_xy)
+            :param bucket: width of bucket (see data_time_delta)
+            :param aggregate: 'sum', 'count', 'mean', 'min' or 'max' of values in bucket
+            :return: block of middles of buckets & aggregated values, width of bucket (days)
+        """
+        days = ChartDataHelper.data_time_delta(bucket)
+        if len(xy[0]) == 0:
+            return xy, days
+        keys = np.floor(xy[0] / days) * days
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+        if aggregate == 'count':
+            values = counts.astype(float)
+        elif aggregate == 'mean':
+            values = np.add.reduceat(xy[1], starts) / counts
+        elif aggregate in ('sum', 'min', 'max'):
+            values = {'sum': np.add, 'min': np.minimum, 'max': np.maximum}[aggregate].reduceat(xy[1], starts)
+        else:
+            raise ValueError(f"Unknown aggregate '{aggregate}', expected sum, count, mean, min or max")
+        return np.array([keys[starts] + days / 2, values]), days
+    
+    @staticmethod
+    def data_decimate(x: np.ndarray, y: np.ndarray, columns: int):
+        """
+            This method reduces line to first, min, max & last point of each column (M4 downsampling):
+            drawn with width of column equal to one pixel, the line looks the same as the original one
+            
+            :param x: x values in ascending order
+            :param y: y values
+            :param columns: count of columns (pixel width of axes)
+            :return: x values, y values of remaining points
+        """
+        count = len(x)
+        span = x[-1] - x[0] if count else 0
+        if count <= 4 * columns or not span > 0:
+            return x, y
+        col = np.minimum(((x - x[0]) * (columns / span)).astype(np.intp), columns - 1)
+        starts = np.flatnonzero(np.r_[True, col[1:] != col[:-1]])
+        ends = np.r_[starts[1:], count] - 1
+        order = np.lexsort((y, col))
+        keep = np.unique(np.concatenate((starts, ends, order[starts], order[ends])))
+        return x[keep], y[keep]
+    
+    @staticmethod
+    def data_envelope(x: np.ndarray, y: np.ndarray, columns: int, width: float = 0.8):
+        """
+            This method reduces bars to max positive & min negative value of each column
+            
+            :param x: x values of bars
+            :param y: y values of bars
+            :param columns: count of columns (pixel width of axes)
+            :param width: width of source bars
+            :return: x values (centers of columns), y values, width of column
+        """
+        edges = np.linspace(x.min() - width / 2, x.max() + width / 2, columns + 1)
+        col = np.clip(np.searchsorted(edges, x, side = 'right') - 1, 0, columns - 1)
+        order = np.argsort(col, kind = 'stable')
+        col, values = col[order], y[order]
+        starts = np.flatnonzero(np.r_[True, col[1:] != col[:-1]])
+        top = np.maximum.reduceat(np.maximum(values, 0), starts)
+        bottom = np.minimum.reduceat(np.minimum(values, 0), starts)
+        centers = (edges[col[starts]] + edges[col[starts] + 1]) / 2
+        return (np.concatenate((centers[top > 0], centers[bottom < 0])),
+                np.concatenate((top[top > 0], bottom[bottom < 0])),
+                edges[1] - edges[0])
+    
     @staticmethod
     def data_sort_by_y(x_y_data: list):
         """
@@ -823,5 +2438,8 @@ class ChartDataHelper():
             :param max_y: upper range limit
             :return: Filtered sequence
         """
+        if isinstance(src_data, np.ndarray):
+            mask = (src_data[:, 0] > min_x) & (src_data[:, 0] < max_x) & (src_data[:, 1] > min_y) & (src_data[:, 1] < max_y)
+            return src_data[mask]
         out_data = [item for item in src_data if item[0] > min_x and item[0] < max_x and item[1] > min_y and item[1] < max_y]
         return out_data
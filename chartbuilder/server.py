@@ -0,0 +1,300 @@
+# Render server: renders chart specs (see spec.py) on the pool of pre-warmed worker processes.
+# python -m chartbuilder serve [--host 127.0.0.1] [--port 8080] [--processes N] [--queue N] [--timeout S]
+# Endpoints:
+# POST /render   - chart spec (JSON) -> image bytes (Content-Type by format)
+#                  400 invalid spec, 413 too large request, 503 queue is full, 504 rendering timeout (workers are restarted)
+# GET  /metrics  - counters, latency & queue state (JSON)
+# GET  /health   - {"status": "ok"}
+
+import os
+import json
+import threading
+import time
+import functools
+import multiprocessing
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Union
+
+from .chartbuilder import QuantileSketch, worker_pool
+from .spec import render_spec, SpecError
+
+class QueueFullError(Exception):
+    """ Count of requests in progress reached queue_size """
+
+class _RenderTask():
+    """ Chart spec in progress: pool which renders it, time of sending to this pool & result set by callback of this pool """
+    __slots__ = ('spec', 'pool', 'started', 'done', 'result', 'error')
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.pool = None
+        self.started = None
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class RenderMetrics():
+    """
+        This class counts requests of render server (thread safe)
+
+        method: count(name, value): increase counter
+        method: rendered(seconds, size): count rendered image & its latency
+        method: snapshot(): return all counters as dict
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__started = time.time()
+        self.__counters = dict.fromkeys(('requests', 'rendered', 'invalid', 'errors', 'rejected', 'timeouts', 'restarts', 'bytes'), 0)
+        self.__latency = QuantileSketch()
+
+    def count(self, name: str, value: int = 1):
+        with self.__lock:
+            self.__counters[name] += value
+
+    def rendered(self, seconds: float, size: int):
+        with self.__lock:
+            self.__counters['rendered'] += 1
+            self.__counters['bytes'] += size
+            self.__latency.update([seconds])
+
+    def snapshot(self) -> dict:
+        with self.__lock:
+            latency = {}
+            if self.__latency.count:
+                p50, p95, p99 = self.__latency.quantiles([0.5, 0.95, 0.99]).tolist()
+                latency = {"p50": p50, "p95": p95, "p99": p99, "max": self.__latency.max}
+            return {**self.__counters, "latency_seconds": latency, "uptime_seconds": time.time() - self.__started}
+
+class RenderServer(ThreadingHTTPServer):
+    """
+        HTTP server of chart rendering: each request is rendered by worker process of pool,
+        count of requests in progress (rendering & waiting for worker) is limited by queue_size.
+        Pool gets at most one spec per worker, the rest waits in the queue of server, so timeout of spec starts
+        when it's sent to the pool (a free worker picks it up at once), time of waiting in the queue isn't counted.
+        Rendering can't be interrupted inside of worker, so after timeout the pool is replaced by new one 
+        (the old one is terminated) & other specs in progress are sent to the new pool
+
+        property: pool: pool of worker processes (see worker_pool)
+        property: queue_size: maximum count of requests in progress, next requests are rejected (503)
+        property: render_timeout: maximum seconds of rendering by worker, without waiting for free worker
+            (504, workers are restarted)
+        property: max_body: maximum size of chart spec (bytes)
+        property: files: allow references to local files in chart specs
+        property: metrics: counters of requests (see RenderMetrics)
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple, processes: Union[int, None] = None, queue_size: Union[int, None] = None, timeout: float = 30.0,
+                 max_body: int = 64 * 2 ** 20, backgrounds: Union[list, None] = None, files: bool = False, quiet: bool = False):
+        """
+            Creates an instance of render server & starts worker processes
+
+            :param address: (host, port), port 0 - any free port
+            :param processes: count of worker processes, default count of CPU
+            :param queue_size: maximum count of requests in progress, default 2 * count of worker processes
+            :param timeout: maximum seconds of rendering by worker (waiting for free worker isn't counted)
+            :param max_body: maximum size of chart spec (bytes)
+            :param backgrounds: background image files loaded by workers before the first request
+            :param files: allow references to local files in chart specs
+            :param quiet: don't log requests
+        """
+        super().__init__(address, RenderHandler)
+        self.processes = processes or multiprocessing.cpu_count()
+        self.queue_size = queue_size or 2 * self.processes
+        self.render_timeout = timeout
+        self.max_body = max_body
+        self.files = files
+        self.quiet = quiet
+        self.metrics = RenderMetrics()
+        self.backgrounds = backgrounds
+        os.environ.setdefault('MPLBACKEND', 'Agg') ## workers render into memory only, without GUI
+        self.pool = worker_pool(self.processes, backgrounds)
+        self.__slots = threading.BoundedSemaphore(self.queue_size)
+        self.__lock = threading.Lock()
+        self.__waiting = deque() ## tasks waiting for free worker
+        self.__running = set() ## tasks sent to the current pool
+
+    def render(self, spec: dict) -> tuple:
+        """
+            This method renders chart spec by worker process
+
+            :param spec: chart spec
+            :return: image bytes, info (see render_spec)
+            :raise QueueFullError: queue is full
+            :raise multiprocessing.TimeoutError: image isn't rendered in timeout (pool is restarted)
+        """
+        if not self.__slots.acquire(blocking = False):
+            raise QueueFullError(f"Render queue is full ({self.queue_size} requests in progress)")
+        task = _RenderTask(spec)
+        try:
+            with self.__lock:
+                self.__waiting.append(task)
+                self.__dispatch()
+            while not task.done.is_set():
+                started = task.started
+                if started is None: ## waiting for free worker
+                    task.done.wait(self.render_timeout)
+                    continue
+                remaining = started + self.render_timeout - time.monotonic()
+                if remaining > 0:
+                    task.done.wait(remaining)
+                elif self.__restart(task, started):
+                    raise multiprocessing.TimeoutError(f"Chart isn't rendered in {self.render_timeout} seconds")
+                ## else finished just now or sent to new pool after timeout of another task: timeout starts again
+            if task.error is not None:
+                raise task.error
+            return task.result
+        finally:
+            self.__slots.release()
+
+    def __dispatch(self):
+        """ This method sends waiting tasks to the current pool while it has free workers (called with lock) """
+        while self.__waiting and len(self.__running) < self.processes:
+            self.__submit(self.__waiting.popleft())
+
+    def __submit(self, task: _RenderTask):
+        """ This method sends task to the current pool (called with lock) """
+        task.pool = self.pool
+        task.started = time.monotonic()
+        self.__running.add(task)
+        self.pool.apply_async(render_spec, (task.spec, self.files), 
+                              callback = functools.partial(self.__finish, task, self.pool, None),
+                              error_callback = functools.partial(self.__finish, task, self.pool, 'error'))
+
+    def __finish(self, task: _RenderTask, pool, kind, value):
+        with self.__lock:
+            if task.pool is not pool: ## result of pool which was replaced is ignored (task is sent to new pool)
+                return
+            if kind == 'error':
+                task.error = value
+            else:
+                task.result = value
+            self.__running.discard(task)
+            self.__dispatch()
+            task.done.set()
+
+    def __restart(self, stuck: _RenderTask, started: float) -> bool:
+        """
+            This method replaces pool which doesn't render task in timeout & sends other tasks of this pool to new pool
+
+            :return: False if task is finished just now or it's sent to new pool after timeout of another task
+        """
+        with self.__lock:
+            if stuck.done.is_set() or stuck.started != started:
+                return False
+            old = self.pool
+            self.pool = worker_pool(self.processes, self.backgrounds)
+            self.__running.discard(stuck)
+            stuck.pool = None
+            tasks, self.__running = self.__running, set()
+            for task in tasks:
+                self.__submit(task)
+            self.__dispatch()
+        self.metrics.count('restarts')
+        threading.Thread(target = self.__terminate, args = (old,), daemon = True).start()
+        return True
+
+    @staticmethod
+    def __terminate(pool):
+        pool.terminate()
+        pool.join()
+
+    def state(self) -> dict:
+        return {
+            **self.metrics.snapshot(),
+            "in_progress" : len(self.__waiting) + len(self.__running),
+            "waiting"     : len(self.__waiting),
+            "queue_size"  : self.queue_size,
+            "processes"   : self.processes,
+            "timeout"     : self.render_timeout,
+        }
+
+    def server_close(self):
+        super().server_close()
+        self.pool.terminate()
+        self.pool.join()
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """ Request handler of render server """
+    server: RenderServer
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self.__reply(200, json.dumps(self.server.state()).encode(), 'application/json')
+        elif self.path == '/health':
+            self.__reply(200, b'{"status": "ok"}', 'application/json')
+        else:
+            self.__error(404, f"Not found: {self.path}")
+
+    def do_POST(self):
+        if self.path != '/render':
+            self.__error(404, f"Not found: {self.path}")
+            return
+        metrics = self.server.metrics
+        metrics.count('requests')
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.server.max_body:
+            metrics.count('invalid')
+            self.__error(413, f"Chart spec must be up to {self.server.max_body} bytes")
+            return
+        try:
+            spec = json.loads(self.rfile.read(length))
+        except ValueError as e: ## invalid JSON (or its encoding)
+            metrics.count('invalid')
+            self.__error(400, f"Invalid JSON: {e}")
+            return
+        try:
+            data, info = self.server.render(spec)
+        except SpecError as e:
+            metrics.count('invalid')
+            self.__error(400, str(e))
+        except QueueFullError as e:
+            metrics.count('rejected')
+            self.__error(503, str(e), {'Retry-After': '1'})
+        except multiprocessing.TimeoutError:
+            metrics.count('timeouts')
+            self.__error(504, f"Chart isn't rendered in {self.server.render_timeout} seconds")
+        except Exception as e:
+            metrics.count('errors')
+            self.__error(500, f"{type(e).__name__}: {e}")
+        else:
+            metrics.rendered(info['seconds'], len(data))
+            self.__reply(200, data, info['content_type'], {'X-Render-Seconds': f"{info['seconds']:.4f}"})
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def __error(self, code: int, message: str, headers: Union[dict, None] = None):
+        self.__reply(code, json.dumps({"error": message}).encode(), 'application/json', headers)
+
+    def __reply(self, code: int, body: bytes, content_type: str, headers: Union[dict, None] = None):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(host: str = '127.0.0.1', port: int = 8080, **kwargs):
+    """
+        This function runs render server until interrupted (Ctrl+C)
+
+        :param host: address of server
+        :param port: port of server
+        :param **kwargs: other arguments of RenderServer (processes, queue_size, timeout, backgrounds, files, quiet)
+    """
+    server = RenderServer((host, port), **kwargs)
+    print(f"ChartBuilder render server on http://{server.server_address[0]}:{server.server_address[1]} "
+          f"({server.processes} workers, queue {server.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
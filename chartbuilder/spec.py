@@ -0,0 +1,230 @@
+# Chart specs: JSON description of diagramm (type of chart, settings & sets of data) rendered into image bytes.
+# Used by render server (python -m chartbuilder serve) & batch rendering (python -m chartbuilder batch)
+# Spec:
+# {
+#     "chart": "Scatter" | "LineGraph" | "Hist" | "Bar" | "Pie" | "Box",
+#     "title": "Main Title", "xlabel": "X Axis Label", "ylabel": "Y Axis Label",     ## optional
+#     "format": "png" | "webp" | "jpeg" | "svg" | "pdf",                                ## optional, default "png"
+#     "encoding": "fast" | "small" | "webp" | "jpeg", "quality": 80,                   ## optional, see ChartBuilder.setEncoding
+#     "size": [800, 600], "dpi": 90,                                                   ## optional
+#     "facecolor": "white" | ["white", 0.5], "bgcolor": ..., "fontcolor": ...,         ## optional
+#     "grid": true, "ticks": true, "x_ticks": [...], "item_names": [...],              ## optional
+#     "bgimage": "img/bgimage.jpg",                                                    ## optional, only if files are allowed
+#     "render_budget": [1.0, 512],                                                     ## optional, see ChartBuilder.setRenderBudget
+#     "data": [
+#         {"dataset": [[x1, y1], [x2, y2], ...], "label": "Legend Label", "color": "g"},  ## arguments of data class (ScatterData etc.)
+#         {"x": [...], "y": [...], "time": "s", "label": "Legend Label"},                 ## arrays (LineData, BarData)
+#         {"file": "track.csv", "columns": ["x", "y"], "label": "Legend Label"},          ## CSV (TSV) file, only if files are allowed
+#         {"file": "values.csv", "columns": ["value"], "dtype": "int"},                   ## optional "dtype": "float" (default) | "int"
+#     ]
+# }
+
+import io
+import os
+import math
+import time
+
+import numpy as np
+import matplotlib
+
+from .chartbuilder import Scatter, LineGraph, Hist, Bar, Pie, Box, ChartDataHelper
+
+## Chart class & name of its data class:
+CHARTS = {
+    'Scatter'   : (Scatter, 'ScatterData'),
+    'LineGraph' : (LineGraph, 'LineData'),
+    'Hist'      : (Hist, 'HistData'),
+    'Bar'       : (Bar, 'BarData'),
+    'Pie'       : (Pie, 'PieData'),
+    'Box'       : (Box, 'BoxData'),
+}
+
+DTYPES = {'float': float, 'int': int}
+
+CONTENT_TYPES = {
+    'png'  : 'image/png',
+    'webp' : 'image/webp',
+    'jpeg' : 'image/jpeg',
+    'svg'  : 'image/svg+xml',
+    'pdf'  : 'application/pdf',
+}
+
+MAX_PIXELS = 40 * 10 ** 6 ## width * height of image (RGBA buffer of 160 MB)
+
+class SpecError(ValueError):
+    """ Invalid chart spec """
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def check_settings(spec: dict):
+    """
+        This function checks types & ranges of settings of chart spec (before anything is rendered)
+
+        :param spec: chart spec (see above)
+        :raise SpecError: invalid setting
+    """
+    for key in ('title', 'xlabel', 'ylabel', 'format', 'encoding', 'bgimage'):
+        if spec.get(key) is not None and not isinstance(spec[key], str):
+            raise SpecError(f"'{key}' must be a string")
+    for key in ('grid', 'ticks'):
+        if key in spec and not isinstance(spec[key], bool):
+            raise SpecError(f"'{key}' must be true or false")
+    for key in ('x_ticks', 'item_names'):
+        if key in spec and not isinstance(spec[key], list):
+            raise SpecError(f"'{key}' must be a list")
+    if 'size' in spec:
+        size = spec['size']
+        if not (isinstance(size, list) and len(size) == 2 and all(_is_number(value) and value >= 1 for value in size)):
+            raise SpecError("'size' must be [width, height] in pixels")
+        if size[0] * size[1] > MAX_PIXELS:
+            raise SpecError(f"'size' must be up to {MAX_PIXELS} pixels")
+    if 'dpi' in spec and not (_is_number(spec['dpi']) and 1 <= spec['dpi'] <= 1200):
+        raise SpecError("'dpi' must be a number from 1 to 1200")
+    for key, alpha in (('facecolor', True), ('bgcolor', True), ('fontcolor', False)):
+        value = spec.get(key)
+        if value is None:
+            continue
+        value = value if isinstance(value, list) else [value]
+        if not (1 <= len(value) <= (2 if alpha else 1) and isinstance(value[0], str) and all(_is_number(v) for v in value[1:])):
+            raise SpecError(f"'{key}' must be a color" + (" or [color, alpha]" if alpha else ""))
+    if spec.get('quality') is not None and not (_is_number(spec['quality']) and 1 <= spec['quality'] <= 100):
+        raise SpecError("'quality' must be a number from 1 to 100")
+    budget = spec.get('render_budget')
+    if budget is not None and not (isinstance(budget, list) and len(budget) <= 2 and all(v is None or (_is_number(v) and v > 0) for v in budget)):
+        raise SpecError("'render_budget' must be null or [seconds, memory_mb]")
+
+def build_chart(spec: dict, files: bool = False):
+    """
+        This function creates diagramm & its sets of source data from spec
+
+        :param spec: chart spec (see above)
+        :param files: allow references to local files (background image, CSV files of data)
+        :return: diagramm, list of sets of source data
+    """
+    if not isinstance(spec, dict):
+        raise SpecError('Chart spec must be an object')
+    if spec.get('chart') not in CHARTS:
+        raise SpecError(f"Unknown chart '{spec.get('chart')}', expected one of {', '.join(CHARTS)}")
+    check_settings(spec)
+    cls, data_name = CHARTS[spec['chart']]
+    chart = cls(spec.get('title'), spec.get('xlabel'), spec.get('ylabel'))
+    if 'size' in spec:
+        chart.setSize(*spec['size'])
+    if 'dpi' in spec:
+        chart.dpi = spec['dpi']
+    for key, method in (('facecolor', chart.setFaceColor), ('bgcolor', chart.setBgColor), ('fontcolor', chart.setFontColor)):
+        if spec.get(key) is not None:
+            value = spec[key] if isinstance(spec[key], list) else [spec[key]]
+            method(*value)
+    if spec.get('grid') is False:
+        chart.DisableGrid()
+    if spec.get('ticks') is False:
+        chart.HideTicks()
+    if 'x_ticks' in spec:
+        chart.setXTicks(spec['x_ticks'])
+    if 'item_names' in spec and hasattr(chart, 'setItemNames'):
+        chart.setItemNames(spec['item_names'])
+    if 'render_budget' in spec:
+        budget = spec['render_budget'] or [None, None] ## null - always plain drawing
+        chart.setRenderBudget(*budget)
+    if spec.get('bgimage') is not None:
+        if not files:
+            raise SpecError('References to local files are not allowed')
+        chart.setBgImage(spec['bgimage'])
+
+    if not isinstance(spec.get('data', []), list):
+        raise SpecError('Sets of data must be a list')
+    data_cls = getattr(chart, data_name)
+    data = []
+    for i, item in enumerate(spec.get('data', [])):
+        if not isinstance(item, dict):
+            raise SpecError(f"Set of data #{i} must be an object")
+        item = dict(item)
+        if 'file' in item:
+            if not files:
+                raise SpecError('References to local files are not allowed')
+            dtype = item.pop('dtype', 'float')
+            if dtype not in DTYPES:
+                raise SpecError(f"Unknown dtype '{dtype}' of set of data #{i}, expected one of {', '.join(DTYPES)}")
+            item['dataset'] = load_file(item.pop('file'), item.pop('columns', None), item.pop('delimiter', None), item.pop('header', True),
+                                        DTYPES[dtype])
+        try:
+            if 'x' in item and 'y' in item and hasattr(data_cls, 'fromArrays'):
+                data.append(data_cls.fromArrays(item.pop('x'), item.pop('y'), **item))
+            else:
+                data.append(data_cls(**item))
+        except (TypeError, ValueError) as e:
+            raise SpecError(f"Invalid set of data #{i} for {data_name}: {e}")
+    return chart, data
+
+def load_file(filename: str, columns = None, delimiter = None, header: bool = True, dtype = float) -> np.ndarray:
+    """
+        This function reads set of data from CSV (TSV) file (see ChartDataHelper.csv_read_chunks)
+
+        :param filename: name of CSV (TSV) file
+        :param columns: selected columns (indexes or names from header), default all columns
+        :param delimiter: columns delimiter, default by extension of file
+        :param header: first line of file contains names of columns
+        :param dtype: type of values (float, int)
+        :return: 1-d array of values (one column) or 2-d array of rows
+    """
+    try:
+        chunks = list(ChartDataHelper.csv_read_chunks(filename, columns, dtype, delimiter = delimiter, header = header))
+    except (OSError, ValueError) as e:
+        raise SpecError(f"Can't read '{filename}': {e}")
+    if not chunks:
+        return np.empty((0, 2), dtype) if columns is None or len(columns) > 1 else np.empty(0, dtype)
+    return np.concatenate(chunks)
+
+def render_file(spec: dict, filename: str, files: bool = True) -> dict:
+    """
+        This function renders chart spec into the file (written completely or not at all)
+
+        :param spec: chart spec (see above)
+        :param filename: name of image file
+        :param files: allow references to local files
+        :return: info (see render_spec)
+    """
+    data, info = render_spec(spec, files)
+    folder = os.path.dirname(filename)
+    if folder:
+        os.makedirs(folder, exist_ok = True)
+    temp = f"{filename}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, filename)
+    return info
+
+def render_spec(spec: dict, files: bool = False) -> tuple:
+    """
+        This function renders chart spec into image bytes (in memory, without files)
+
+        :param spec: chart spec (see above)
+        :param files: allow references to local files (background image, CSV files of data)
+        :return: image bytes, info: chart, format, content type, size (bytes) & seconds of rendering
+    """
+    start = time.perf_counter()
+    chart, data = build_chart(spec, files)
+    fmt = spec.get('format', 'png')
+    if fmt not in CONTENT_TYPES:
+        raise SpecError(f"Unknown format '{fmt}', expected one of {', '.join(CONTENT_TYPES)}")
+    encoding = spec.get('encoding')
+    if encoding is None and fmt in chart.encoding_profiles:
+        encoding = fmt ## webp & jpeg are encoded by profile
+    if encoding is not None and fmt not in chart.vector_formats:
+        if encoding not in chart.encoding_profiles:
+            raise SpecError(f"Unknown encoding '{encoding}', expected one of {', '.join(chart.encoding_profiles)}")
+        chart.setEncoding(encoding, spec.get('quality'))
+        fmt = chart.encoding_profiles[encoding]["format"]
+    buffer = io.BytesIO()
+    chart.fileToSave(buffer)
+    with matplotlib.rc_context({'savefig.format': fmt}):
+        chart.Plot(*data)
+    return buffer.getvalue(), {
+        "chart"        : spec['chart'],
+        "format"       : fmt,
+        "content_type" : CONTENT_TYPES[fmt],
+        "bytes"        : buffer.tell(),
+        "seconds"      : time.perf_counter() - start,
+    }
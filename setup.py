@@ -11,5 +11,5 @@ setup(
     url="https://github.com/greentracery/ChartBuilder",
     version=chartbuilder.__version__,
     packages=find_packages(),
-    install_requires=['matplotlib', 'pillow']
+    install_requires=['matplotlib', 'numpy', 'pillow']
 )
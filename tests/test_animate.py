@@ -0,0 +1,33 @@
+import io
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from chartbuilder.chartbuilder import Scatter, _gif_write
+
+def test_gif_frames_are_written_one_by_one():
+    rng = np.random.default_rng(5)
+    noise = rng.integers(0, 256, (40, 60, 3), dtype = np.uint8) ## more than 256 colors
+    frames = [noise.copy() for i in range(4)]
+    frames[1][10:20, 5:15] = frames[2][10:20, 5:15] = 0
+    frames[3][:] = 255
+    f = io.BytesIO()
+    assert _gif_write(f, (Image.fromarray(frame) for frame in frames), 120) == 4
+    gif = Image.open(io.BytesIO(f.getvalue()))
+    assert gif.n_frames == 4 and gif.info["duration"] == 120 and gif.info["loop"] == 0
+    decoded = [np.asarray(frame.convert('RGB')) for frame in ImageSequence.Iterator(gif)]
+    expected = [np.asarray(Image.fromarray(frame).quantize(256, method = Image.Quantize.FASTOCTREE).convert('RGB')) for frame in frames]
+    assert np.array_equal(decoded[0], expected[0])
+    assert np.array_equal(decoded[1][10:20, 5:15], expected[1][10:20, 5:15])
+    assert np.array_equal(decoded[2], decoded[1])
+    assert np.array_equal(decoded[3], expected[3])
+
+def test_animate_to_file_object_and_sequence(tmp_path):
+    p = Scatter('Track')
+    p.setSize(200, 150)
+    frames = [p.ScatterData([(i, i)], None, 'r', 'o') for i in range(5)]
+    f = io.BytesIO()
+    assert p.Animate(frames, filename = f, limits = (0, 5, 0, 5))["frames"] == 5
+    assert Image.open(io.BytesIO(f.getvalue())).n_frames == 5
+    stats = p.Animate(frames, filename = str(tmp_path / 'frame_{:02d}.png'), limits = (0, 5, 0, 5))
+    assert stats["frames"] == 5 and (tmp_path / 'frame_04.png').exists()
@@ -0,0 +1,36 @@
+import json
+import time
+
+from chartbuilder import batch
+from chartbuilder.spec import render_file
+
+def hanging_render(spec: dict, output: str, files: bool = False):
+    if spec.get("title") == 'hang':
+        time.sleep(60)
+    return render_file(spec, output, files)
+
+def write_specs(tmp_path, titles: list) -> str:
+    filename = str(tmp_path / 'specs.jsonl')
+    with open(filename, 'w') as f:
+        for i, title in enumerate(titles):
+            f.write(json.dumps({"chart": "Bar", "title": title, "output": f"{i}.png", "data": [{"dataset": [[1, 2], [2, 3]]}]}) + '\n')
+    return filename
+
+def test_rendered_and_skipped(tmp_path):
+    filename = write_specs(tmp_path, ['a', 'b'])
+    summary = batch.run_batch(filename, str(tmp_path), processes = 1)
+    assert (summary['rendered'], summary['failed']) == (2, 0)
+    assert (tmp_path / '1.png').exists()
+    assert batch.run_batch(filename, str(tmp_path), processes = 1)['skipped'] == 2
+
+def test_hung_worker_times_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, 'render_file', hanging_render)
+    filename = write_specs(tmp_path, ['a', 'hang', 'b'])
+    messages = []
+    start = time.perf_counter()
+    summary = batch.run_batch(filename, str(tmp_path), processes = 1, in_flight = 1, timeout = 2, log = messages.append)
+    assert time.perf_counter() - start < 30
+    assert (summary['rendered'], summary['failed'], summary['timeouts']) == (2, 1, 1)
+    assert len(messages) == 1 and 'specs.jsonl:2: ' in messages[0] and '1.png: no result in 2 s' in messages[0]
+    with open(filename + '.manifest.json') as f:
+        assert sorted(json.load(f)) == [str(tmp_path / '0.png'), str(tmp_path / '2.png')]
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from chartbuilder.chartbuilder import BgImageCache
+
+def save(tmp_path, mode: str, name: str) -> str:
+    filename = str(tmp_path / name)
+    gradient = np.linspace(0, 255, 400, dtype = np.uint8)
+    Image.fromarray(np.dstack([*np.meshgrid(gradient, gradient), np.full((400, 400), 128, np.uint8)])).convert(mode).save(filename)
+    return filename
+
+@pytest.mark.parametrize('pyramid', [False, True])
+@pytest.mark.parametrize('mode, name', [('P', 'palette.png'), ('P', 'palette.gif'), ('1', 'bilevel.png'), ('L', 'gray.png'), ('LA', 'alpha.png')])
+def test_modes_are_scaled(tmp_path, mode, name, pyramid):
+    filename = save(tmp_path, mode, name)
+    cache = BgImageCache(pyramid = pyramid)
+    array = cache.get(filename, (90, 90))
+    assert array.shape[:2] == (90, 90) and array.shape[2] in (3, 4)
+    assert cache.get(filename, (100, 50), True, (0, 0, 200, 100)).shape[:2] == (50, 100)
+
+def test_pyramids_are_bounded(tmp_path):
+    cache = BgImageCache(pyramid = True, max_pyramids = 2)
+    names = [save(tmp_path, 'RGB', f'{i}.png') for i in range(4)]
+    for filename in names:
+        cache.get(filename, (50, 50))
+    assert [key[0] for key in cache._BgImageCache__levels] == [str(tmp_path / '2.png'), str(tmp_path / '3.png')]
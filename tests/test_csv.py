@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from chartbuilder.chartbuilder import ChartDataHelper
+
+def write(tmp_path, text: str, name: str = 'data.csv') -> str:
+    filename = str(tmp_path / name)
+    with open(filename, 'w') as f:
+        f.write(text)
+    return filename
+
+def test_chunks_and_columns(tmp_path):
+    filename = write(tmp_path, 'x,y\n' + ''.join(f'{i},{i * 2}\n' for i in range(10)))
+    chunks = list(ChartDataHelper.csv_read_chunks(filename, ['y', 'x'], chunk_size = 4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert np.array_equal(np.concatenate(chunks), np.c_[np.arange(10) * 2, np.arange(10)])
+    values = np.concatenate(list(ChartDataHelper.csv_read_chunks(filename, ['x'], int)))
+    assert values.dtype.kind == 'i' and values.tolist() == list(range(10))
+
+def test_blank_field_is_nan(tmp_path):
+    filename = write(tmp_path, 'x,y,z\n1,2,3\n4,,6\n\n7,8,9\n')
+    rows = np.concatenate(list(ChartDataHelper.csv_read_chunks(filename)))
+    assert rows.shape == (3, 3)
+    assert np.isnan(rows[1, 1]) and rows[2].tolist() == [7, 8, 9]
+    assert np.isnan(np.concatenate(list(ChartDataHelper.csv_read_chunks(filename, ['y'])))).sum() == 1
+
+def test_error_reports_line_in_file(tmp_path):
+    filename = write(tmp_path, 'x,y\n' + '1,2\n' * 5 + '3,abc\n')
+    with pytest.raises(ValueError, match = 'line 7'):
+        list(ChartDataHelper.csv_read_chunks(filename, chunk_size = 3))
+    filename = write(tmp_path, 'x,y\n1,2\n3,\n', 'ints.csv')
+    with pytest.raises(ValueError, match = 'line 3: empty field'):
+        list(ChartDataHelper.csv_read_chunks(filename, dtype = int))
+
+def test_tsv_without_header(tmp_path):
+    filename = write(tmp_path, '1\t2\n3\t\n', 'data.tsv')
+    rows = np.concatenate(list(ChartDataHelper.csv_read_chunks(filename, header = False)))
+    assert rows[0].tolist() == [1, 2] and np.isnan(rows[1, 1])
@@ -0,0 +1,27 @@
+import numpy as np
+
+from chartbuilder.chartbuilder import Bar, ChartDataHelper
+
+def test_numbers_become_float_block():
+    xy, dropped = ChartDataHelper.data_split_xy(np.array([(1, 2), (3, 4)]))
+    assert dropped == 0 and xy.dtype == float and xy.tolist() == [[1, 3], [2, 4]]
+    xy, dropped = ChartDataHelper.data_split_xy([(1, 2), (3, 4, 5), 6, (7.5, True)])
+    assert dropped == 2 and xy.tolist() == [[1, 7.5], [2, 1]]
+    assert ChartDataHelper.data_split_xy([])[0].shape == (2, 0)
+
+def test_string_labels_stay_strings():
+    xy, dropped = ChartDataHelper.data_split_xy(np.array([('10', '5'), ('nan', 'inf')]))
+    assert dropped == 0 and xy.tolist() == [['10', 'nan'], ['5', 'inf']]
+    bar = Bar.BarData(np.array([('10', 5), ('2', 3), ('07', 1), ('nan', 2)], dtype = object))
+    assert list(bar.x_values) == ['07', '10', '2', 'nan']
+    assert list(bar.y_values) == [1, 5, 3, 2]
+
+def test_short_and_long_lists():
+    for count in (10, 5000):
+        labels = [(str(i), i) for i in range(count)]
+        xy, dropped = ChartDataHelper.data_split_xy(labels)
+        assert dropped == 0 and xy[0].tolist() == [str(i) for i in range(count)]
+        xy, dropped = ChartDataHelper.data_split_xy([(i, i * 0.5) for i in range(count)])
+        assert xy.dtype == float and xy.flags.c_contiguous and xy[1, -1] == (count - 1) * 0.5
+    bar = Bar.BarData([('10', 5), ('2', 3), ('07', 1), ('nan', 2)])
+    assert list(bar.x_values) == ['07', '10', '2', 'nan']
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from chartbuilder.chartbuilder import LineGraph
+
+def retained(data):
+    """ Points kept in ring buffer (in order of appending) """
+    first = max(0, data._total - data.capacity)
+    idx = np.arange(first, data._total) % data.capacity
+    return data._raw[0, idx], data._raw[1, idx]
+
+@pytest.mark.parametrize('capacity, max_points', [(1000, 100), (1000, 4), (997, 50), (10, 4), (100000, 4096)])
+def test_view_covers_retained_window(capacity, max_points):
+    rng = np.random.default_rng(0)
+    data = LineGraph.LiveData(capacity, max_points = max_points)
+    start = 0
+    for step in range(200):
+        count = int(rng.integers(1, 200))
+        data.extend(np.arange(start, start + count, dtype = float), rng.normal(size = count))
+        start += count
+        x, y = data.view()
+        raw_x, raw_y = retained(data)
+        assert x[0] == raw_x[0] and x[-1] == raw_x[-1]
+        assert y.min() == raw_y.min() and y.max() == raw_y.max()
+        assert np.all(np.diff(x) >= 0)
+        assert len(x) <= max_points + 2 * data.block + 4
+
+def test_small_buffer_is_not_decimated():
+    data = LineGraph.LiveData(100, max_points = 200)
+    for i in range(250):
+        data.append(i, i % 7)
+    x, y = data.view()
+    assert np.array_equal(x, np.arange(150, 250))
+    assert np.array_equal(y, np.arange(150, 250) % 7)
+
+def test_window():
+    data = LineGraph.LiveData(1000, max_points = 100)
+    data.extend(np.arange(5000.0), np.zeros(5000))
+    x, y = data.view(window = 50)
+    assert x[0] >= 4949 and x[-1] == 4999
+
+def test_points_out_of_order():
+    data = LineGraph.LiveData(10)
+    data.append(5, 1)
+    with pytest.raises(ValueError):
+        data.append(4, 1)
+    with pytest.raises(ValueError):
+        data.extend([6, 5], [1, 1])
+    with pytest.raises(ValueError):
+        data.extend([1, 2], [1])
@@ -0,0 +1,62 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from chartbuilder.chartbuilder import QuantileSketch
+
+QS = np.linspace(0, 1, 101)
+
+def rank_error(sketch, values) -> float:
+    """ Maximum distance between q & the rank range of the returned quantile over QS """
+    values = np.sort(values)
+    result = sketch.quantiles(QS)
+    low = np.searchsorted(values, result, 'left') / len(values)
+    high = np.searchsorted(values, result, 'right') / len(values)
+    return float(np.max(np.maximum(0, np.maximum(low - QS, QS - high))))
+
+def data(seed: int, count: int = 200000) -> np.ndarray:
+    return np.random.default_rng(seed).lognormal(size = count)
+
+@pytest.mark.parametrize('k', [50, 200])
+@pytest.mark.parametrize('seed', range(5))
+def test_chunked_updates(k, seed):
+    values = data(seed)
+    sketch = QuantileSketch(k, seed = seed)
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    assert sketch.count == len(values)
+    assert sketch.min == values.min() and sketch.max == values.max()
+    assert rank_error(sketch, values) <= 3 / k
+    assert sketch.size() <= 3 * k
+
+@pytest.mark.parametrize('seed', range(5))
+def test_merged_sketches(seed):
+    values = data(seed)
+    parts = [QuantileSketch(200, seed = 10 * seed + i).update(chunk) for i, chunk in enumerate(np.array_split(values, 8))]
+    sketch = parts[0]
+    for part in parts[1:]:
+        sketch.merge(part)
+    assert sketch.count == len(values)
+    assert rank_error(sketch, values) <= 3 / 200
+    assert sketch.size() <= 3 * 200
+
+def test_pickle_round_trip():
+    values = data(1)
+    sketch = QuantileSketch(200, seed = 1).update(values)
+    restored = pickle.loads(pickle.dumps(sketch))
+    assert restored.count == sketch.count and restored.size() == sketch.size()
+    assert np.array_equal(restored.quantiles(QS), sketch.quantiles(QS))
+    assert rank_error(restored, values) <= 3 / 200
+    ## restored sketch still accepts values & merges
+    restored.merge(QuantileSketch(200, seed = 2).update(data(2)))
+    assert restored.count == 2 * len(values)
+    assert rank_error(restored, np.concatenate((values, data(2)))) <= 3 / 200
+
+def test_nan_and_empty():
+    sketch = QuantileSketch()
+    sketch.update([])
+    assert sketch.count == 0 and sketch.size() == 0
+    sketch.update([1.0, float('nan'), 3.0, 2.0])
+    assert sketch.count == 3
+    assert sketch.min == 1.0 and sketch.max == 3.0
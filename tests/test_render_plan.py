@@ -0,0 +1,65 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from chartbuilder.chartbuilder import Scatter, LineGraph, ChartDataHelper
+
+@pytest.mark.parametrize('count, columns', [(100000, 500), (12345, 300), (2001, 500)])
+def test_data_decimate(count, columns):
+    rng = np.random.default_rng(count)
+    x = np.sort(rng.random(count) * 1000)
+    y = rng.normal(size = count)
+    dx, dy = ChartDataHelper.data_decimate(x, y, columns)
+    assert len(dx) <= 4 * columns
+    assert np.all(np.diff(dx) >= 0)
+    ## remaining points are source points, first & last points are kept
+    index = np.searchsorted(x, dx)
+    assert np.array_equal(x[index], dx) and np.array_equal(y[index], dy)
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    ## each column keeps its min & max
+    col = np.minimum(((x - x[0]) * (columns / (x[-1] - x[0]))).astype(np.intp), columns - 1)
+    dcol = col[index]
+    for c in np.unique(col):
+        assert dy[dcol == c].min() == y[col == c].min()
+        assert dy[dcol == c].max() == y[col == c].max()
+
+def test_data_decimate_short_line():
+    x, y = np.arange(10.0), np.arange(10.0)
+    dx, dy = ChartDataHelper.data_decimate(x, y, 100)
+    assert dx is x and dy is y
+
+def test_budget_is_disabled_by_default(tmp_path):
+    p = Scatter('Scatter')
+    p.fileToSave(str(tmp_path / 'plain.svg'))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        p.Plot(p.ScatterData(np.random.default_rng(1).normal(size = (5000, 2)), 'A', 'r'))
+    item = p.render_plan["items"][0]
+    assert item["strategy"] == 'plain' and item["points_drawn"] == 5000
+
+def test_vector_scatter_uses_density(tmp_path):
+    p = Scatter('Scatter')
+    p.setRenderBudget(1.0, 512)
+    p.fileToSave(str(tmp_path / 'density.svg'))
+    p.Plot(p.ScatterData(np.random.default_rng(1).normal(size = (50000, 2)), 'A', 'r'))
+    item = p.render_plan["items"][0]
+    assert item["strategy"] == 'density' and item["points_drawn"] == 50000
+
+def test_density_ignores_nan_and_inf(tmp_path):
+    points = np.random.default_rng(1).normal(size = (400000, 2))
+    points[0] = np.nan
+    points[1, 0] = np.inf
+    p = Scatter('Scatter')
+    p.setRenderBudget(0.2, 512)
+    p.fileToSave(str(tmp_path / 'density.png'))
+    p.Plot(p.ScatterData(points, 'A', 'r'))
+    assert p.render_plan["items"][0]["strategy"] == 'density'
+
+def test_downsample_warns(tmp_path):
+    p = LineGraph('LineGraph')
+    p.setRenderBudget(1e-6, None)
+    p.fileToSave(str(tmp_path / 'line.png'))
+    x = np.arange(100000.0)
+    with pytest.warns(UserWarning, match = 'downsample'):
+        p.Plot(p.LineData.fromArrays(x, np.sin(x / 1000), 'A', 'b'))
@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chartbuilder import server as render_server
+from chartbuilder.spec import render_spec
+
+BAR = {"chart": "Bar", "data": [{"dataset": [[1, 2], [2, 3]]}]}
+
+def sleeping_render(spec: dict, files: bool = False):
+    spec = dict(spec)
+    time.sleep(spec.pop("sleep", 0))
+    return render_spec(spec, files)
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(render_server, 'render_spec', sleeping_render)
+    server = render_server.RenderServer(('127.0.0.1', 0), processes = 1, queue_size = 2, timeout = 3.0, quiet = True)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def request(server, path: str, spec = None) -> tuple:
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    data = None if spec is None else (spec if isinstance(spec, bytes) else json.dumps(spec).encode())
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data = data), timeout = 60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+def test_render_and_errors(server):
+    status, body = request(server, '/render', BAR)
+    assert status == 200 and body[:8] == b'\x89PNG\r\n\x1a\n'
+    assert request(server, '/render', {**BAR, "chart": "Line"})[0] == 400
+    assert request(server, '/render', b'{bad')[0] == 400
+    assert request(server, '/unknown')[0] == 404
+
+def test_queue_full_and_waiting_not_counted(server):
+    with ThreadPoolExecutor(2) as pool:
+        ## the second spec waits 2 s for the only worker: 4 s since request, but 2 s of rendering < timeout
+        first = pool.submit(request, server, '/render', {**BAR, "sleep": 2})
+        time.sleep(0.5)
+        second = pool.submit(request, server, '/render', {**BAR, "sleep": 2})
+        time.sleep(0.5)
+        assert server.state()["waiting"] == 1
+        status, body = request(server, '/render', BAR)
+        assert status == 503 and b'queue is full' in body
+        assert first.result()[0] == 200 and second.result()[0] == 200
+
+def test_timeout_restarts_workers(server):
+    status, body = request(server, '/render', {**BAR, "sleep": 60})
+    assert status == 504 and b"isn't rendered" in body
+    assert request(server, '/render', BAR)[0] == 200
+    status, body = request(server, '/metrics')
+    metrics = json.loads(body)
+    assert status == 200
+    assert (metrics["timeouts"], metrics["restarts"], metrics["rendered"], metrics["in_progress"]) == (1, 1, 1, 0)
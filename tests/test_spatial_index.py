@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from chartbuilder.chartbuilder import Scatter, SpatialIndex, ChartDataHelper
+
+def rectangles(rng, bounds, count: int = 200):
+    """ Random rectangles: inside, overlapping & outside of bounds, degenerate ones & full view """
+    low, high = np.asarray(bounds[:2]), np.asarray(bounds[2:])
+    span = high - low
+    for i in range(count):
+        a = low - span * 0.2 + rng.random(2) * span * 1.4
+        b = a + rng.random(2) * span * rng.choice([0.01, 0.25, 1.0])
+        yield (a[0], a[1], b[0], b[1])
+    yield tuple(bounds)
+    yield (low[0] - 1, low[1] - 1, high[0] + 1, high[1] + 1)
+    yield (high[0], high[1], high[0] + 1, high[1] + 1)
+    yield (low[0], low[1], low[0], high[1])
+
+@pytest.mark.parametrize('kind', ['uniform', 'clustered', 'grid', 'line'])
+def test_query_matches_data_crop(kind):
+    rng = np.random.default_rng(7)
+    if kind == 'uniform':
+        points = rng.random((20000, 2)) * [1000, 500]
+    elif kind == 'clustered':
+        points = np.concatenate([rng.normal(center, 3, size = (4000, 2)) for center in rng.random((5, 2)) * 500])
+    elif kind == 'grid': ## many points on cell borders
+        points = np.stack(np.meshgrid(np.arange(100.0), np.arange(100.0)), axis = -1).reshape(-1, 2)
+    else: ## all points with the same y
+        points = np.c_[rng.random(5000) * 100, np.full(5000, 3.0)]
+    index = SpatialIndex(points, cell_points = 16)
+    assert index.count == len(points)
+    for rect in rectangles(rng, index.bounds):
+        expected = ChartDataHelper.data_crop(points, *rect)
+        found = index.crop(*rect)
+        assert np.array_equal(found, expected), rect
+        assert np.all(np.diff(index.query(*rect)) > 0)
+
+def test_crop_of_scatter_data():
+    rng = np.random.default_rng(3)
+    points = rng.random((5000, 2))
+    values = rng.integers(0, 5, 5000)
+    item = Scatter.ScatterData(points, 'Track', 'r', 'o', values = values, cmap = 'viridis')
+    index = SpatialIndex(item)
+    crop = index.crop(0.2, 0.3, 0.6, 0.7)
+    mask = (points[:, 0] > 0.2) & (points[:, 0] < 0.6) & (points[:, 1] > 0.3) & (points[:, 1] < 0.7)
+    assert isinstance(crop, Scatter.ScatterData)
+    assert np.array_equal(crop.xy, points[mask].T)
+    assert np.array_equal(crop.values, values[mask])
+    assert (crop.label, crop.color, crop.marker, crop.cmap) == ('Track', 'r', 'o', 'viridis')
+
+def test_empty_and_list_source():
+    assert len(SpatialIndex(np.empty((0, 2))).query(0, 0, 1, 1)) == 0
+    index = SpatialIndex([(1, 1), (2, 2), (3, 3)])
+    assert index.query(1.5, 1.5, 3.5, 3.5).tolist() == [1, 2]
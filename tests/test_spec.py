@@ -0,0 +1,20 @@
+import pytest
+
+from chartbuilder.spec import render_spec, SpecError
+
+BAR = {"chart": "Bar", "data": [{"dataset": [[1, 2], [2, 3]]}]}
+
+@pytest.mark.parametrize('settings', [
+    {"dpi": "x"}, {"dpi": 0}, {"size": [800]}, {"size": "800x600"}, {"size": [100000, 100000]},
+    {"facecolor": ["white", "x"]}, {"fontcolor": ["red", 0.5]}, {"grid": "no"}, {"quality": 0},
+    {"render_budget": [1, -2]}, {"title": 5}, {"format": "gif"}, {"bgimage": "img/bgimage.jpg"},
+    {"chart": "Line"}, {"data": {}}, {"data": [{"unknown": 1}]},
+])
+def test_invalid_settings(settings):
+    with pytest.raises(SpecError):
+        render_spec({**BAR, **settings})
+
+def test_valid_settings():
+    data, info = render_spec({**BAR, "dpi": 72, "size": [400, 300], "facecolor": ["white", 0.5], "fontcolor": "red",
+                              "grid": False, "render_budget": None, "format": "webp", "quality": 80})
+    assert info["format"] == 'webp' and info["bytes"] == len(data) > 0
@@ -0,0 +1,41 @@
+import datetime
+import warnings
+
+import numpy as np
+
+from chartbuilder.chartbuilder import LineGraph, Bar
+
+START = datetime.datetime(2026, 1, 1)
+
+def stamps(count: int) -> list:
+    return [START + datetime.timedelta(hours = i) for i in range(count)]
+
+def test_missing_first_timestamp():
+    points = [(None, 1.0), *zip(stamps(5), range(5)), (None, 2.0)]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        line = LineGraph.LineData(points, 'A')
+        bar = Bar.BarData(points, 'A')
+        arrays = LineGraph.LineData.fromArrays([None, *stamps(3)], [0, 1, 2, 3], 'A')
+    for item, count, dropped in ((line, 5, 2), (bar, 5, 2), (arrays, 3, 1)):
+        assert item.time is True
+        assert item.dropped == dropped
+        assert item.xy.shape[1] == count and np.all(np.diff(item.xy[0]) > 0)
+
+def test_datetime64_and_objects_match():
+    values = stamps(100)
+    a = LineGraph.LineData.fromArrays(values, np.arange(100))
+    b = LineGraph.LineData.fromArrays(np.array(values, dtype = 'datetime64[us]'), np.arange(100))
+    assert np.allclose(a.x, b.x)
+    assert np.isclose(a.x[1] - a.x[0], 1 / 24)
+
+def test_epoch_numbers():
+    seconds = np.arange(0, 3600 * 5, 3600)
+    line = LineGraph.LineData.fromArrays(seconds, np.arange(5), time = 's')
+    assert line.time == 's'
+    assert np.allclose(np.diff(line.x), 1 / 24)
+
+def test_numbers_are_not_time():
+    line = LineGraph.LineData([(3, 1), (1, 2), (2, 3)])
+    assert line.time is False
+    assert line.x.tolist() == [1, 2, 3]